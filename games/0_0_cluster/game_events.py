@@ -1,4 +1,4 @@
-from copy import deepcopy
+from src.events.events import copy_payload
 
 APPLY_TUMBLE_MULTIPLIER = "applyMultiplierToTumble"
 UPDATE_GRID = "updateGrid"
@@ -9,6 +9,6 @@ def update_grid_mult_event(gamestate):
     event = {
         "index": len(gamestate.book.events),
         "type": UPDATE_GRID,
-        "gridMultipliers": deepcopy(gamestate.position_multipliers),
+        "gridMultipliers": copy_payload(gamestate.position_multipliers),
     }
     gamestate.book.add_event(event)
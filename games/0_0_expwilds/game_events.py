@@ -1,8 +1,7 @@
 """Events specific to new and updating expanding wild symbols."""
 
-from copy import deepcopy
 from src.events.event_constants import EventConstants
-from src.events.events import json_ready_sym
+from src.events.events import json_ready_sym, copy_payload
 
 NEW_EXP_WILDS = "newExpandingWilds"
 UPDATE_EXP_WILDS = "updateExpandingWilds"
@@ -18,13 +17,13 @@ def new_expanding_wild_event(gamestate) -> None:
         for ew in new_exp_wilds:
             ew["row"] += 1
 
-    event = {"index": len(gamestate.book.events), "type": NEW_EXP_WILDS, "newWilds": new_exp_wilds}
+    event = {"index": len(gamestate.book.events), "type": NEW_EXP_WILDS, "newWilds": copy_payload(new_exp_wilds)}
     gamestate.book.add_event(event)
 
 
 def update_expanding_wild_event(gamestate) -> None:
     """On each reveal - the multiplier value on the expanding wild is updated (sent before reveal)"""
-    existing_wild_details = deepcopy(gamestate.expanding_wilds)
+    existing_wild_details = copy_payload(gamestate.expanding_wilds)
     wild_event = []
     if gamestate.config.include_padding:
         for ew in existing_wild_details:
@@ -43,7 +42,7 @@ def new_sticky_event(gamestate, new_sticky_syms: list):
             sym["row"] += 1
             sym["prize"] = int(sym["prize"] * 100)
 
-    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": new_sticky_syms}
+    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": copy_payload(new_sticky_syms)}
     gamestate.book.add_event(event)
 
 
@@ -52,7 +51,7 @@ def win_info_prize_event(gamestate, include_padding_index=True):
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
     win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
+    win_data_copy["wins"] = copy_payload(gamestate.win_data["wins"])
     prize_details = []
     for _, w in enumerate(win_data_copy["wins"]):
         if include_padding_index:
@@ -94,8 +93,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
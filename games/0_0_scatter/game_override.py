@@ -1,6 +1,7 @@
 from game_executables import *
 from src.events.events import update_freespin_event, update_global_mult_event
 from src.calculations.statistics import get_random_outcome
+from src.calculations.scatter import ScatterBoardCounts
 
 
 class GameStateOverride(GameExecutables):
@@ -14,6 +15,15 @@ class GameStateOverride(GameExecutables):
         super().reset_book()
         # Reset parameters relevant to local game only
         self.tumble_win = 0
+        self.scatter_counts = ScatterBoardCounts(self.config)
+
+    def draw_board(self, emit_event: bool = True, trigger_symbol: str = "scatter") -> None:
+        super().draw_board(emit_event, trigger_symbol)
+        self.scatter_counts.count_board(self.board)
+
+    def tumble_game_board(self):
+        super().tumble_game_board()
+        self.scatter_counts.update_from_tumble(self.board)
 
     def reset_fs_spin(self):
         super().reset_fs_spin()
@@ -0,0 +1,230 @@
+"""Vectorized win evaluation for stacks of integer-encoded boards."""
+
+from typing import List
+import numpy as np
+
+from src.config.config import Config
+
+
+class BatchWins:
+    """
+    Evaluate many boards at once. Boards are passed as an (N, num_reels, max_rows) array of symbol ids, as set by
+    Board.encode_board or Board.draw_board_ids, with -1 below a reel's height. Multipliers are an optional array
+    of the same shape, values <= 1 are treated as no multiplier.
+
+    Each function returns {"totalWin": (N,) array, ...} with per-board win details. Win amounts match the
+    single-board evaluators up to floating point summation order.
+    """
+
+    @staticmethod
+    def get_pay_table(config: Config, symbol_names: List[str]) -> np.ndarray:
+        """Paytable as an array indexed [count, symbol id], 0 where nothing pays."""
+        max_count = max(count for count, _ in config.paytable)
+        pays = np.zeros((max_count + 1, len(symbol_names)))
+        for (count, name), payout in config.paytable.items():
+            if name in symbol_names:
+                pays[count, symbol_names.index(name)] = payout
+        return pays
+
+    @staticmethod
+    def get_wild_ids(config: Config, symbol_names: List[str], wild_key: str = "wild") -> np.ndarray:
+        """Ids of symbols listed under config.special_symbols[wild_key]."""
+        return np.array([idx for idx, name in enumerate(symbol_names) if name in config.special_symbols[wild_key]])
+
+    @staticmethod
+    def get_multipliers(board_ids: np.ndarray, board_multipliers: np.ndarray = None) -> np.ndarray:
+        """Symbol multiplier values, 0 where a position has no multiplier above 1."""
+        if board_multipliers is None:
+            return np.zeros(board_ids.shape)
+        return np.where(board_multipliers > 1, board_multipliers, 0)
+
+    @staticmethod
+    def get_lines(
+        config: Config,
+        symbol_names: List[str],
+        board_ids: np.ndarray,
+        board_multipliers: np.ndarray = None,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+        multiplier_method: str = "symbol",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """
+        Lines wins for every board, as Lines.get_lines. Returns totalWin, lineWins and kinds, both of shape
+        (N, num_paylines) in config.paylines order.
+        """
+        assert multiplier_method in ["symbol", "global", "combined"]
+        line_rows = np.array(list(config.paylines.values()), dtype=np.intp)
+        num_boards = len(board_ids)
+        num_reels = line_rows.shape[1]
+        pays = BatchWins.get_pay_table(config, symbol_names)
+        reel_index = np.arange(num_reels)
+
+        line_ids = board_ids[:, reel_index, line_rows].astype(np.intp)
+        # Cells below a reel's height (-1) are neither wild nor the line symbol, so a line ends at them
+        missing = line_ids < 0
+        line_wilds = np.isin(line_ids, BatchWins.get_wild_ids(config, symbol_names, wild_key))
+        non_wilds = ~line_wilds
+        has_first = non_wilds.any(axis=2)
+        wild_matches = np.where(has_first, non_wilds.argmax(axis=2), num_reels)
+        first_ids = np.take_along_axis(line_ids, np.minimum(wild_matches, num_reels - 1)[:, :, None], axis=2)[:, :, 0]
+        has_first &= first_ids >= 0
+        runs = ((line_ids == first_ids[:, :, None]) & ~missing) | line_wilds
+        kinds = np.where(runs.all(axis=2), num_reels, (~runs).argmax(axis=2))
+
+        base_wins = np.where(has_first, pays[np.minimum(kinds, len(pays) - 1), np.maximum(first_ids, 0)], 0)
+        base_wins[kinds >= len(pays)] = 0
+        wild_wins = np.zeros(base_wins.shape)
+        if wild_sym in symbol_names:
+            wild_pays = pays[:, symbol_names.index(wild_sym)]
+            wild_wins = np.where(wild_matches < len(wild_pays), wild_pays[np.minimum(wild_matches, len(pays) - 1)], 0)
+        use_wild = wild_wins > base_wins
+        line_wins = np.where(use_wild, wild_wins, base_wins)
+        kinds = np.where(use_wild, wild_matches, kinds)
+
+        if multiplier_method in ["symbol", "combined"]:
+            line_mults = BatchWins.get_multipliers(board_ids, board_multipliers)[:, reel_index, line_rows]
+            in_win = reel_index[None, None, :] < kinds[:, :, None]
+            symbol_mults = np.maximum((line_mults * in_win).sum(axis=2), 1)
+            line_wins = np.round(line_wins * symbol_mults, 2)
+        if multiplier_method in ["global", "combined"]:
+            line_wins = line_wins * global_multiplier
+        if multiplier_method == "global":
+            line_wins = np.round(line_wins, 2)
+
+        kinds = np.where(line_wins > 0, kinds, 0)
+        return {"totalWin": line_wins.sum(axis=1) if num_boards else np.zeros(0), "lineWins": line_wins, "kinds": kinds}
+
+    @staticmethod
+    def get_ways(
+        config: Config,
+        symbol_names: List[str],
+        board_ids: np.ndarray,
+        board_multipliers: np.ndarray = None,
+        wild_key: str = "wild",
+        global_multiplier: int = 1,
+        multiplier_strategy: str = "symbol",
+    ) -> dict:
+        """
+        Ways wins for every board, as Ways.get_ways_data. Returns totalWin, symbolWins, kinds and ways,
+        each of shape (N, num_symbols) indexed by symbol id.
+        """
+        assert multiplier_strategy in ["symbol", "global"]
+        pays = BatchWins.get_pay_table(config, symbol_names)
+        is_wild = np.isin(board_ids, BatchWins.get_wild_ids(config, symbol_names, wild_key))
+        if multiplier_strategy == "symbol" and board_multipliers is not None:
+            weights = np.where(board_multipliers > 1, board_multipliers, 1)
+        else:
+            weights = np.ones(board_ids.shape)
+        wild_weights = (weights * is_wild).sum(axis=2)
+
+        num_boards, num_reels, _ = board_ids.shape
+        symbol_wins = np.zeros((num_boards, len(symbol_names)))
+        symbol_kinds = np.zeros((num_boards, len(symbol_names)), dtype=int)
+        symbol_ways = np.zeros((num_boards, len(symbol_names)))
+        for symbol_id in np.flatnonzero(pays.any(axis=0)):
+            matches = board_ids == symbol_id
+            reel_weights = (weights * matches).sum(axis=2) + wild_weights
+            on_reel = matches.any(axis=2) | is_wild.any(axis=2)
+            kinds = np.where(on_reel.all(axis=1), num_reels, (~on_reel).argmax(axis=1))
+            kinds = np.where(matches[:, 0, :].any(axis=1), kinds, 0)
+            in_win = np.arange(num_reels)[None, :] < kinds[:, None]
+            ways = np.where(in_win, reel_weights, 1).prod(axis=1)
+            wins = np.round(pays[np.minimum(kinds, len(pays) - 1), symbol_id] * (kinds < len(pays)) * ways, 2)
+            if multiplier_strategy == "global":
+                wins = np.round(wins * global_multiplier, 2)
+            symbol_wins[:, symbol_id] = wins
+            symbol_kinds[:, symbol_id] = np.where(wins > 0, kinds, 0)
+            symbol_ways[:, symbol_id] = np.where(wins > 0, ways, 0)
+
+        return {"totalWin": symbol_wins.sum(axis=1), "symbolWins": symbol_wins, "kinds": symbol_kinds, "ways": symbol_ways}
+
+    @staticmethod
+    def get_scatterpays(
+        config: Config,
+        symbol_names: List[str],
+        board_ids: np.ndarray,
+        board_multipliers: np.ndarray = None,
+        wild_key: str = "wild",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """
+        Pay-anywhere wins for every board, as Scatter.get_scatterpay_wins. Returns totalWin, symbolWins and
+        counts, each of shape (N, num_symbols) indexed by symbol id.
+        """
+        pays = BatchWins.get_pay_table(config, symbol_names)
+        is_wild = np.isin(board_ids, BatchWins.get_wild_ids(config, symbol_names, wild_key))
+        multipliers = BatchWins.get_multipliers(board_ids, board_multipliers)
+        wild_counts = is_wild.sum(axis=(1, 2))
+        wild_mults = (multipliers * is_wild).sum(axis=(1, 2))
+
+        num_boards = len(board_ids)
+        symbol_wins = np.zeros((num_boards, len(symbol_names)))
+        symbol_counts = np.zeros((num_boards, len(symbol_names)), dtype=int)
+        for symbol_id in np.flatnonzero(pays.any(axis=0)):
+            if symbol_names[symbol_id] in config.special_symbols[wild_key]:
+                continue
+            matches = board_ids == symbol_id
+            symbol_count = matches.sum(axis=(1, 2))
+            counts = np.where(symbol_count > 0, symbol_count + wild_counts, 0)
+            symbol_mults = np.maximum((multipliers * matches).sum(axis=(1, 2)) + wild_mults, 1)
+            wins = pays[np.minimum(counts, len(pays) - 1), symbol_id] * (counts < len(pays))
+            symbol_wins[:, symbol_id] = wins * global_multiplier * symbol_mults
+            symbol_counts[:, symbol_id] = np.where(wins > 0, counts, 0)
+
+        return {"totalWin": symbol_wins.sum(axis=1), "symbolWins": symbol_wins, "counts": symbol_counts}
+
+    @staticmethod
+    def get_clusters(
+        config: Config,
+        symbol_names: List[str],
+        board_ids: np.ndarray,
+        board_multipliers: np.ndarray = None,
+        wild_key: str = "wild",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """
+        Cluster wins for every board, as Cluster.get_clusters with Cluster.evaluate_clusters.
+        Clusters are labelled for all boards at once: every symbol cell starts with its own label and labels
+        spread to the largest neighbouring label through symbol and wild cells until they stop changing, so the
+        number of passes grows with the longest cluster path. Returns totalWin and symbolWins, (N, num_symbols).
+        """
+        pays = BatchWins.get_pay_table(config, symbol_names)
+        wild_ids = BatchWins.get_wild_ids(config, symbol_names, wild_key)
+        is_wild = np.isin(board_ids, wild_ids)
+        multipliers = BatchWins.get_multipliers(board_ids, board_multipliers)
+        num_boards, num_reels, stride = board_ids.shape
+        num_labels = num_reels * stride + 1
+        cell_labels = np.arange(1, num_labels).reshape(num_reels, stride)
+        board_offsets = np.arange(num_boards)[:, None, None] * num_labels
+
+        symbol_wins = np.zeros((num_boards, len(symbol_names)))
+        for symbol_id in np.flatnonzero(pays.any(axis=0)):
+            if symbol_id in wild_ids:
+                continue
+            matches = board_ids == symbol_id
+            if not matches.any():
+                continue
+            allowed = matches | is_wild
+            labels = np.where(matches, cell_labels, 0)
+            while True:
+                grown = labels.copy()
+                np.maximum(grown[:, 1:, :], labels[:, :-1, :], out=grown[:, 1:, :])
+                np.maximum(grown[:, :-1, :], labels[:, 1:, :], out=grown[:, :-1, :])
+                np.maximum(grown[:, :, 1:], labels[:, :, :-1], out=grown[:, :, 1:])
+                np.maximum(grown[:, :, :-1], labels[:, :, 1:], out=grown[:, :, :-1])
+                grown *= allowed
+                if np.array_equal(grown, labels):
+                    break
+                labels = grown
+
+            # Wild cells not connected to the symbol keep label 0 and are left out
+            in_cluster = labels > 0
+            keys = (board_offsets + labels)[in_cluster]
+            sizes = np.bincount(keys, minlength=num_boards * num_labels)
+            cluster_mults = np.bincount(keys, weights=multipliers[in_cluster], minlength=num_boards * num_labels)
+            cluster_pays = pays[np.minimum(sizes, len(pays) - 1), symbol_id] * (sizes < len(pays))
+            cluster_wins = cluster_pays * np.maximum(cluster_mults, 1) * global_multiplier
+            symbol_wins[:, symbol_id] = cluster_wins.reshape(num_boards, num_labels).sum(axis=1)
+
+        return {"totalWin": symbol_wins.sum(axis=1), "symbolWins": symbol_wins}
@@ -2,8 +2,10 @@
 
 import random
 from typing import List
+import numpy as np
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
+from src.calculations.reelstrip import CompiledReelstrip
 from src.events.events import reveal_event
 
 
@@ -25,35 +27,18 @@ class Board(GeneralGameState):
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
         reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        compiled_reelstrip = self.get_compiled_reelstrip(self.reelstrip_id)
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
             reel_pos = reel_positions[reel]
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-                if sym.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
+                top_symbols.append(self.create_symbol(compiled_reelstrip.top_padding[reel][reel_pos]))
+                bottom_symbols.append(self.create_symbol(compiled_reelstrip.bottom_padding[reel][reel_pos]))
+            board[reel] = [self.create_symbol(name) for name in compiled_reelstrip.windows[reel][reel_pos]]
+            first_scatter_reel = self.record_window_special_symbols(
+                board, compiled_reelstrip.special_rows[reel][reel_pos], reel, first_scatter_reel
+            )
             padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
 
         if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
@@ -67,16 +52,21 @@ class Board(GeneralGameState):
                 raise RuntimeError
 
         self.board = board
-        self.get_special_symbols_on_board()
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
         self.anticipation = anticipation
         if self.config.include_padding:
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
+        if self.config.encode_board:
+            self.encode_board(self.draw_board_ids(self.reelstrip_id, reel_positions))
 
-    def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
-        """Creates a gameboard from specified stopping positions."""
+    def force_board_from_reelstrips(
+        self, reelstrip_id: str, force_stop_positions: List[List], reel_positions: List[int] = None
+    ) -> None:
+        """Creates a gameboard from specified stopping positions.
+        reel_positions: window start position for every reel, used as-is instead of placing forced stops
+        on a random row."""
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
@@ -88,43 +78,27 @@ class Board(GeneralGameState):
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
 
-        reel_positions = [None] * self.config.num_reels
+        if reel_positions is None:
+            reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
             reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
                 reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
 
+        compiled_reelstrip = self.get_compiled_reelstrip(self.reelstrip_id)
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
+            reel_pos = reel_positions[reel] % len(self.reelstrip[reel])
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-
-                if sym.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
+                top_symbols.append(self.create_symbol(compiled_reelstrip.top_padding[reel][reel_pos]))
+                bottom_symbols.append(self.create_symbol(compiled_reelstrip.bottom_padding[reel][reel_pos]))
+            board[reel] = [self.create_symbol(name) for name in compiled_reelstrip.windows[reel][reel_pos]]
+            first_scatter_reel = self.record_window_special_symbols(
+                board, compiled_reelstrip.special_rows[reel][reel_pos], reel, first_scatter_reel
+            )
+            if len(board[reel]) > 0:
                 padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
 
         if first_scatter_reel > -1 and first_scatter_reel <= self.config.num_reels:
@@ -140,6 +114,109 @@ class Board(GeneralGameState):
         if self.config.include_padding:
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
+        if self.config.encode_board:
+            self.encode_board(self.draw_board_ids(self.reelstrip_id, reel_positions))
+
+    def get_compiled_reelstrip(self, reelstrip_id: str) -> CompiledReelstrip:
+        """Precompiled window and special symbol tables for a reelstrip."""
+        if reelstrip_id not in self.compiled_reels:
+            self.compiled_reels[reelstrip_id] = CompiledReelstrip(self.config, self.config.reels[reelstrip_id])
+        return self.compiled_reels[reelstrip_id]
+
+    def record_window_special_symbols(
+        self, board: List[List[object]], special_rows: tuple, reel: int, first_scatter_reel: int
+    ) -> int:
+        """
+        Record special symbols in a newly drawn reel window by their attributes, as get_special_symbols_on_board
+        does, returning the first reel with enough scatters.
+        """
+        for row in special_rows:
+            symbol = board[reel][row]
+            for special_type, positions in self.special_syms_on_board.items():
+                if not symbol.check_attribute(special_type):
+                    continue
+                positions.append({"reel": reel, "row": row})
+                if (
+                    special_type == "scatter"
+                    and len(positions) >= self.config.anticipation_triggers[self.gametype]
+                    and first_scatter_reel == -1
+                ):
+                    first_scatter_reel = reel + 1
+        return first_scatter_reel
+
+    def get_encoded_reelstrip(self, reelstrip_id: str) -> List[np.ndarray]:
+        """Reelstrip as one array of symbol ids per reel, encoded the first time it is used."""
+        if reelstrip_id not in self.encoded_reels:
+            self.encoded_reels[reelstrip_id] = [
+                np.array([self.symbol_storage.get_symbol_id(name) for name in reel], dtype=np.int16)
+                for reel in self.config.reels[reelstrip_id]
+            ]
+        return self.encoded_reels[reelstrip_id]
+
+    def draw_board_ids(self, reelstrip_id: str, reel_positions: List[int]) -> np.ndarray:
+        """
+        Integer board of shape (num_reels, max(num_rows)) taken directly from the encoded reelstrip.
+        Positions below a reel's height are -1.
+        """
+        reelstrip = self.get_encoded_reelstrip(reelstrip_id)
+        board_ids = np.full((self.config.num_reels, max(self.config.num_rows)), -1, dtype=np.int16)
+        for reel, strip in enumerate(reelstrip):
+            rows = self.config.num_rows[reel]
+            board_ids[reel, :rows] = strip[(reel_positions[reel] + np.arange(rows)) % len(strip)]
+        return board_ids
+
+    def draw_board_id_batch(self, reelstrip_id: str, num_boards: int) -> np.ndarray:
+        """
+        Integer boards of shape (num_boards, num_reels, max(num_rows)) at uniformly drawn stops, for BatchWins.
+        Stops are drawn reel by reel for each board in turn, advancing the random state.
+        """
+        reelstrip = self.get_encoded_reelstrip(reelstrip_id)
+        stops = np.array([[random.randrange(len(strip)) for strip in reelstrip] for _ in range(num_boards)])
+        board_ids = np.full((num_boards, self.config.num_reels, max(self.config.num_rows)), -1, dtype=np.int16)
+        for reel, strip in enumerate(reelstrip):
+            rows = self.config.num_rows[reel]
+            board_ids[:, reel, :rows] = strip[(stops[:, reel, None] + np.arange(rows)) % len(strip)]
+        return board_ids
+
+    def encode_board(self, board_ids: np.ndarray = None, multiplier_key: str = "multiplier") -> None:
+        """
+        Set the integer representation of self.board: board_ids, board_multipliers (1 where a symbol has no
+        multiplier) and board_explode. Ids are read from the symbols if board_ids is not passed, e.g. after a tumble.
+        Groundwork for array-based evaluation such as BatchWins: spins still build and evaluate the Symbol board,
+        so the arrays are an extra copy and are only made for drawn boards when config.encode_board is set.
+        """
+        shape = (self.config.num_reels, max(self.config.num_rows))
+        if board_ids is None:
+            board_ids = np.full(shape, -1, dtype=np.int16)
+            for reel, _ in enumerate(self.board):
+                for row, sym in enumerate(self.board[reel]):
+                    board_ids[reel, row] = self.symbol_storage.get_symbol_id(sym.name)
+        board_multipliers = np.ones(shape, dtype=np.float64)
+        board_explode = np.zeros(shape, dtype=bool)
+        for reel, _ in enumerate(self.board):
+            for row, sym in enumerate(self.board[reel]):
+                if sym.check_attribute(multiplier_key):
+                    board_multipliers[reel, row] = sym.get_attribute(multiplier_key)
+                if sym.check_attribute("explode"):
+                    board_explode[reel, row] = True
+        self.board_ids = board_ids
+        self.board_multipliers = board_multipliers
+        self.board_explode = board_explode
+
+    def decode_board(self, board_ids: np.ndarray) -> List[List[object]]:
+        """
+        Materialize a symbol board from an integer board, applying special symbol functions.
+        Special functions which make weighted draws advance the random state.
+        """
+        board = []
+        for reel in range(self.config.num_reels):
+            board.append(
+                [
+                    self.create_symbol(self.symbol_storage.symbol_names[board_ids[reel, row]])
+                    for row in range(self.config.num_rows[reel])
+                ]
+            )
+        return board
 
     def create_symbol(self, name: str) -> object:
         """Create a new symbol and assign relevant attributes."""
@@ -168,6 +245,22 @@ class Board(GeneralGameState):
                         if self.board[reel][row].check_attribute(specialType):
                             self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
 
+    def update_special_symbols_on_reels(self, reels: List[int]) -> None:
+        """
+        Rescan the given reels for special symbols, keeping positions recorded on all other reels.
+        All position dicts are new, so positions held by earlier events or callers are never shared.
+        """
+        if len(reels) == 0:
+            return
+        for special_type, positions in self.special_syms_on_board.items():
+            updated = [{"reel": pos["reel"], "row": pos["row"]} for pos in positions if pos["reel"] not in reels]
+            for reel in reels:
+                for row, sym in enumerate(self.board[reel]):
+                    if sym.special and sym.check_attribute(special_type):
+                        updated.append({"reel": reel, "row": row})
+            updated.sort(key=lambda pos: pos["reel"])
+            self.special_syms_on_board[special_type] = updated
+
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
         return [list(row) for row in zip(*board_string)]
@@ -228,7 +321,15 @@ class Board(GeneralGameState):
         Note: If it is possible for two target symbols to appear on one reel, this method
         will not be able to guarantee an exact number of target symbols or actually random
         reel positions. I.e. Ensure the reels do not have stacked scatter symbols.
+        With config.force_board_sampler = "direct" or "exact" the board is drawn in one pass, see
+        sample_forced_board and sample_exact_board. "exact" also handles stacked target symbols.
         """
+        if self.config.force_board_sampler == "direct":
+            self.sample_forced_board(force_criteria, num_force_syms)
+            return
+        if self.config.force_board_sampler == "exact":
+            self.sample_exact_board(force_criteria, num_force_syms)
+            return
         while True:
             self._force_special_board(force_criteria, num_force_syms)
             if (
@@ -249,7 +350,7 @@ class Board(GeneralGameState):
         reelstrip_id = get_random_outcome(
             self.get_current_distribution_conditions()["reel_weights"][self.gametype]
         )
-        reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
+        reelstops = self.get_compiled_reelstrip(reelstrip_id).get_symbol_stops(force_criteria)
 
         sym_prob = []
         for x in range(self.config.num_reels):
@@ -266,21 +367,92 @@ class Board(GeneralGameState):
         force_stop_positions = dict(sorted(force_stop_positions.items(), key=lambda x: x[0]))
         self.force_board_from_reelstrips(reelstrip_id, force_stop_positions)
 
+    def sample_forced_board(self, force_criteria: str, num_force_syms: int) -> None:
+        """
+        Draw a board with exactly num_force_syms target symbols in one pass.
+        The reelstrip is drawn from reel_weights among those that can give the count, see can_sample_forced_board.
+        Reels without a target-free window are always forced, the remaining forced reels are chosen as in
+        _force_special_board among reels with a single-target window. Each forced reel then stops on a window with
+        exactly one target, and every other reel stops on a window with none.
+        """
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        reelstrip_ids = [
+            reelstrip_id
+            for reelstrip_id, weight in reel_weights.items()
+            if weight > 0 and self.can_sample_forced_board(reelstrip_id, force_criteria, num_force_syms)
+        ]
+        if len(reelstrip_ids) == 0:
+            raise RuntimeError(
+                f"No reelstrip in reel_weights can show exactly {num_force_syms} {force_criteria} "
+                "with at most one per reel."
+            )
+        reelstrip_id = random.choices(reelstrip_ids, [reel_weights[reelstrip_id] for reelstrip_id in reelstrip_ids])[0]
+        compiled_reelstrip = self.get_compiled_reelstrip(reelstrip_id)
+        window_stops = compiled_reelstrip.get_window_stops(force_criteria)
+        symbol_stops = compiled_reelstrip.get_symbol_stops(force_criteria)
+        forced_reels = {reel for reel in range(self.config.num_reels) if 0 not in window_stops[reel]}
+        sym_prob = [
+            (
+                len(symbol_stops[reel]) / len(self.config.reels[reelstrip_id][reel])
+                if reel not in forced_reels and 1 in window_stops[reel]
+                else 0
+            )
+            for reel in range(self.config.num_reels)
+        ]
+        while len(forced_reels) < num_force_syms:
+            possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
+            possible_probs = [p for p in sym_prob if p > 0]
+            chosen_reel = random.choices(possible_reels, possible_probs)[0]
+            sym_prob[chosen_reel] = 0
+            forced_reels.add(chosen_reel)
+
+        reel_positions = [
+            random.choice(window_stops[reel][1 if reel in forced_reels else 0]) for reel in range(self.config.num_reels)
+        ]
+        self.force_board_from_reelstrips(reelstrip_id, {}, reel_positions=reel_positions)
+
+    def can_sample_forced_board(self, reelstrip_id: str, force_criteria: str, num_force_syms: int) -> bool:
+        """
+        Whether sample_forced_board can use this reelstrip: reels without a target-free window must be forced,
+        so they need a window with exactly one target, and num_force_syms must lie between the number of those
+        reels and the number of reels with a single-target window.
+        """
+        window_stops = self.get_compiled_reelstrip(reelstrip_id).get_window_stops(force_criteria)
+        single_reels = sum(1 for stops_by_count in window_stops if 1 in stops_by_count)
+        required_reels = 0
+        for stops_by_count in window_stops:
+            if 0 not in stops_by_count:
+                if 1 not in stops_by_count:
+                    return False
+                required_reels += 1
+        return required_reels <= num_force_syms <= single_reels
+
+    def sample_exact_board(self, force_criteria: str, num_force_syms: int) -> None:
+        """
+        Draw a board showing exactly num_force_syms target symbols in one pass, including stacked targets.
+        The result is a natural reelstrip draw conditioned on the target count: reelstrips are weighted by
+        reel_weights times the probability of showing the count, then stops are drawn from the exact
+        per-reel count distributions.
+        """
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        reelstrip_ids, weights = [], []
+        for reelstrip_id, weight in reel_weights.items():
+            count_ways = self.get_compiled_reelstrip(reelstrip_id).get_count_ways(force_criteria)[0]
+            if count_ways.get(num_force_syms, 0) > 0:
+                reelstrip_ids.append(reelstrip_id)
+                weights.append(weight * count_ways[num_force_syms] / sum(count_ways.values()))
+        if len(reelstrip_ids) == 0:
+            raise RuntimeError(f"No reelstrip in reel_weights can show exactly {num_force_syms} {force_criteria}.")
+
+        reelstrip_id = random.choices(reelstrip_ids, weights)[0]
+        reel_positions = self.get_compiled_reelstrip(reelstrip_id).sample_window_stops(
+            force_criteria, num_force_syms, random
+        )
+        self.force_board_from_reelstrips(reelstrip_id, {}, reel_positions=reel_positions)
+
     def get_syms_on_reel(self, reel_id: str, target_symbol: str) -> List[List]:
         """Return reelstop positions for a specific symbol name."""
-        reel = self.config.reels[reel_id]
-        reelstop_positions = [[] for _ in range(self.config.num_reels)]
-        for r in range(self.config.num_reels):
-            for s in range(len(reel[r])):
-                if (
-                    target_symbol in self.config.special_symbols
-                    and reel[r][s] in self.config.special_symbols[target_symbol]
-                ):
-                    reelstop_positions[r].append(s)
-                elif reel[r][s] == target_symbol:
-                    reelstop_positions[r].append(s)
-
-        return reelstop_positions
+        return [list(stops) for stops in self.get_compiled_reelstrip(reel_id).get_symbol_stops(target_symbol)]
 
     def count_special_symbols(self, special_sym_criteria: str) -> int:
         "Returns integer number of active symbols of any 'special' kind."
@@ -2,10 +2,13 @@ from collections import defaultdict
 from abc import ABC
 from typing import List, Dict
 from src.calculations.board import Board
-from src.calculations.symbol import Symbol
+from src.calculations.symbol import Symbol, get_attribute_bit
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 
+neighbour_tables = {}
+bitboard_masks = {}
+
 
 class Cluster:
     """Collection of cluster-evaluation functions."""
@@ -80,9 +83,137 @@ class Cluster:
                     wild_key,
                 )
 
+    @staticmethod
+    def get_neighbour_table(board_shape: tuple) -> tuple:
+        """
+        Flat cell positions and neighbour cell indexes for a board shape (rows per reel), cached per shape.
+        Neighbours are ordered left, right, up, down to match the recursive search.
+        """
+        if board_shape not in neighbour_tables:
+            positions = [(reel, row) for reel, num_rows in enumerate(board_shape) for row in range(num_rows)]
+            cell_index = {position: idx for idx, position in enumerate(positions)}
+            neighbours = []
+            for reel, row in positions:
+                candidates = [(reel - 1, row), (reel + 1, row), (reel, row - 1), (reel, row + 1)]
+                neighbours.append(tuple(cell_index[pos] for pos in candidates if pos in cell_index))
+            neighbour_tables[board_shape] = (positions, neighbours)
+        return neighbour_tables[board_shape]
+
     @staticmethod
     def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
-        """Return all symbol clusters of size >= 1."""
+        """
+        Return all symbol clusters of size >= 1.
+        Iterative depth-first search over flat cell indexes with integer bitmasks for visited cells. Cluster
+        positions are returned in the same order as get_clusters_recursive.
+        """
+        positions, neighbours = Cluster.get_neighbour_table(tuple(len(reel) for reel in board))
+        names = [symbol.name for reel in board for symbol in reel]
+        wild_mask = get_attribute_bit(wild_key)
+        wilds = [(symbol.flags & wild_mask) != 0 for reel in board for symbol in reel]
+
+        already_checked = 0
+        clusters = defaultdict(list)
+        for cell, symbol in enumerate(names):
+            if (already_checked >> cell) & 1 or wilds[cell]:
+                continue
+            potential_cluster = [positions[cell]]
+            already_checked |= 1 << cell
+            local_checked = 1 << cell
+            to_check = []
+            for neighbour in neighbours[cell]:
+                if not (local_checked >> neighbour) & 1:
+                    local_checked |= 1 << neighbour
+                    to_check.append(neighbour)
+            stack = [iter(to_check)]
+            while stack:
+                for neighbour in stack[-1]:
+                    if wilds[neighbour] or names[neighbour] == symbol:
+                        potential_cluster.append(positions[neighbour])
+                        already_checked |= 1 << neighbour
+                        to_check = []
+                        for next_neighbour in neighbours[neighbour]:
+                            if not (local_checked >> next_neighbour) & 1:
+                                local_checked |= 1 << next_neighbour
+                                to_check.append(next_neighbour)
+                        stack.append(iter(to_check))
+                        break
+                else:
+                    stack.pop()
+            clusters[symbol].append(potential_cluster)
+
+        return clusters
+
+    @staticmethod
+    def get_bitboard_masks(board_shape: tuple) -> tuple:
+        """
+        Bit layout for a board shape: cell (reel, row) is bit reel * stride + row, with stride = max rows.
+        Returns (stride, valid cells, cells with a row above, cells with a row below, positions by bit), cached per shape.
+        """
+        if board_shape not in bitboard_masks:
+            stride = max(board_shape)
+            valid, has_up, has_down = 0, 0, 0
+            positions = {}
+            for reel, num_rows in enumerate(board_shape):
+                for row in range(num_rows):
+                    bit = 1 << (reel * stride + row)
+                    valid |= bit
+                    positions[reel * stride + row] = (reel, row)
+                    if row > 0:
+                        has_up |= bit
+                    if row < num_rows - 1:
+                        has_down |= bit
+            bitboard_masks[board_shape] = (stride, valid, has_up, has_down, positions)
+        return bitboard_masks[board_shape]
+
+    @staticmethod
+    def get_clusters_bitboard(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
+        """
+        Return all symbol clusters of size >= 1 using integer bitboards.
+        Each symbol and the wilds are held as bitmasks and clusters grow by shift-and-mask dilation until
+        fixpoint, so wild cells are never revisited cell by cell. Clusters and symbols are ordered as in
+        get_clusters, positions within a cluster are in board order (reel, then row).
+        """
+        stride, valid, has_up, has_down, positions = Cluster.get_bitboard_masks(tuple(len(reel) for reel in board))
+        wild_bit = get_attribute_bit(wild_key)
+        symbol_masks = {}
+        wilds = 0
+        for reel, symbols in enumerate(board):
+            for row, symbol in enumerate(symbols):
+                if symbol.flags & wild_bit:
+                    wilds |= 1 << (reel * stride + row)
+                else:
+                    symbol_masks[symbol.name] = symbol_masks.get(symbol.name, 0) | 1 << (reel * stride + row)
+
+        clusters = defaultdict(list)
+        for symbol, symbol_mask in symbol_masks.items():
+            allowed = symbol_mask | wilds
+            remaining = symbol_mask
+            while remaining:
+                cluster = remaining & -remaining
+                while True:
+                    grown = (
+                        cluster
+                        | (cluster << stride)
+                        | (cluster >> stride)
+                        | ((cluster & has_down) << 1)
+                        | ((cluster & has_up) >> 1)
+                    ) & allowed & valid
+                    if grown == cluster:
+                        break
+                    cluster = grown
+                remaining &= ~cluster
+                cluster_positions = []
+                while cluster:
+                    lowest = cluster & -cluster
+                    cluster_positions.append(positions[lowest.bit_length() - 1])
+                    cluster ^= lowest
+                clusters[symbol].append(cluster_positions)
+
+        return clusters
+
+    @staticmethod
+    def get_clusters_recursive(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
+        """Return all symbol clusters of size >= 1, using the recursive neighbour search."""
         already_checked = []
         clusters = defaultdict(list)
         for reel, _ in enumerate(board):
@@ -166,9 +297,13 @@ class Cluster:
         global_multiplier: int,
         multiplier_key: str = "multiplier",
         wild_key: str = "wild",
+        bitboard: bool = False,
     ) -> None:
-        """Event-ready win information."""
-        clusters = Cluster.get_clusters(board, wild_key)
+        """Event-ready win information. bitboard=True finds clusters with get_clusters_bitboard."""
+        if bitboard:
+            clusters = Cluster.get_clusters_bitboard(board, wild_key)
+        else:
+            clusters = Cluster.get_clusters(board, wild_key)
         return_data = {
             "totalWin": 0,
             "wins": [],
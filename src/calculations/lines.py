@@ -1,6 +1,8 @@
 """Evaluates and records winds for lines games."""
 
-from src.calculations.symbol import Symbol
+import numpy as np
+
+from src.calculations.symbol import Symbol, get_attribute_bit
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -9,6 +11,75 @@ from src.events.events import (
     set_total_event,
 )
 
+# Games with at least this many paylines are evaluated with CompiledPaylines, below it plain Python is faster.
+COMPILED_PAYLINES_MIN_LINES = 30
+compiled_paylines = {}
+
+
+class CompiledPaylines:
+    """
+    Paylines as a (num_lines, num_reels) row-index array and the paytable as a (kind, symbol id) lookup, so all
+    lines on a board are evaluated with array operations. Symbols missing from the paytable share one id.
+    """
+
+    def __init__(self, config: Config):
+        assert len({len(line) for line in config.paylines.values()}) == 1, "Paylines must all have the same length."
+        self.line_indexes = list(config.paylines.keys())
+        self.line_rows = np.array([config.paylines[line_index] for line_index in self.line_indexes], dtype=np.intp)
+        self.num_reels = self.line_rows.shape[1]
+        self.reel_index = np.arange(self.num_reels)
+        self.line_range = np.arange(len(self.line_indexes))
+        paying_symbols = sorted({name for _, name in config.paytable})
+        self.symbol_ids = {name: idx for idx, name in enumerate(paying_symbols)}
+        self.unknown_id = len(paying_symbols)
+        self.pays = np.zeros((self.num_reels + 1, len(paying_symbols) + 1), dtype=bool)
+        for kind, name in config.paytable:
+            if kind <= self.num_reels:
+                self.pays[kind, self.symbol_ids[name]] = True
+
+    def evaluate(self, board: list[list[Symbol]], wild_key: str, wild_sym: str) -> list:
+        """
+        Leading wild count, matched length and first non-wild symbol for every line.
+        Returns (line_index, wild_matches, kind, has_first_non_wild) for lines where a paytable entry exists.
+        """
+        max_rows = max(len(reel) for reel in board)
+        if all(len(reel) == max_rows for reel in board):
+            symbols = [symbol for reel in board for symbol in reel]
+        else:
+            symbols = [symbol for reel in board for symbol in reel + [None] * (max_rows - len(reel))]
+        ids = np.array(
+            [self.symbol_ids.get(symbol.name, self.unknown_id) if symbol else self.unknown_id for symbol in symbols]
+        ).reshape(len(board), max_rows)
+        flags = np.array([symbol.flags if symbol else 0 for symbol in symbols]).reshape(len(board), max_rows)
+        wilds = (flags & get_attribute_bit(wild_key)) != 0
+        line_ids = ids[self.reel_index, self.line_rows]
+        line_wilds = wilds[self.reel_index, self.line_rows]
+
+        non_wilds = ~line_wilds
+        has_first = non_wilds.any(axis=1)
+        wild_matches = np.where(has_first, non_wilds.argmax(axis=1), self.num_reels)
+        first_ids = line_ids[self.line_range, np.minimum(wild_matches, self.num_reels - 1)]
+        runs = (line_ids == first_ids[:, None]) | line_wilds
+        kinds = np.where(runs.all(axis=1), self.num_reels, (~runs).argmax(axis=1))
+
+        paying = has_first & self.pays[kinds, first_ids]
+        if wild_sym in self.symbol_ids:
+            paying |= self.pays[wild_matches, self.symbol_ids[wild_sym]]
+        return [
+            (self.line_indexes[line], int(wild_matches[line]), int(kinds[line]), bool(has_first[line]))
+            for line in np.flatnonzero(paying)
+        ]
+
+
+def get_compiled_paylines(config: Config) -> CompiledPaylines:
+    """Compiled paylines for a config, cached on the payline rows and paytable entries."""
+    key = (tuple(config.paylines), tuple(map(tuple, config.paylines.values())), tuple(config.paytable))
+    compiled = compiled_paylines.get(key)
+    if compiled is None:
+        compiled = CompiledPaylines(config)
+        compiled_paylines[key] = compiled
+    return compiled
+
 
 class Lines:
     """Collection of functions to handle line-win games."""
@@ -24,6 +95,69 @@ class Lines:
             "meta": meta_data,
         }
 
+    @staticmethod
+    def add_line_win(
+        return_data: dict,
+        board: list[list[Symbol]],
+        config: Config,
+        line_index: int,
+        wild_matches: int,
+        kind: int,
+        first_non_wild: str,
+        wild_sym: str,
+        multiplier_method: str,
+        global_multiplier: int,
+    ) -> None:
+        """Pay the better of the leading-wild win and the full line win, if either pays."""
+        line = config.paylines[line_index]
+        base_win, wild_win = 0, 0
+        if (wild_matches, wild_sym) in config.paytable:
+            wild_win = config.paytable[(wild_matches, wild_sym)]
+        if first_non_wild is not None:
+            if (kind, first_non_wild) in config.paytable:
+                base_win = config.paytable[(kind, first_non_wild)]
+
+        if base_win > 0 or wild_win > 0:
+            if wild_win > base_win:
+                positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
+                line_win, applied_mult = apply_mult(
+                    board, multiplier_method, global_multiplier=global_multiplier, win_amount=wild_win, positions=positions
+                )
+                win_dict = Lines.line_win_info(
+                    board[0][line[0]].name,
+                    wild_matches,
+                    line_win,
+                    positions,
+                    {
+                        "lineIndex": line_index,
+                        "multiplier": applied_mult,
+                        "winWithoutMult": wild_win,
+                        "globalMult": int(global_multiplier),
+                        "lineMultiplier": int(applied_mult / global_multiplier),
+                    },
+                )
+            else:
+                positions = [{"reel": idx, "row": line[idx]} for idx in range(0, kind)]
+                line_win, applied_mult = apply_mult(
+                    board, multiplier_method, global_multiplier=global_multiplier, win_amount=base_win, positions=positions
+                )
+                win_dict = Lines.line_win_info(
+                    first_non_wild,
+                    kind,
+                    line_win,
+                    positions,
+                    {
+                        "lineIndex": line_index,
+                        "multiplier": applied_mult,
+                        "winWithoutMult": base_win,
+                        "globalMult": int(global_multiplier),
+                        "lineMultiplier": int(applied_mult / global_multiplier),
+                    },
+                )
+
+            return_data["totalWin"] += line_win
+            return_data["wins"].append(win_dict)
+
     @staticmethod
     def get_lines(
         board: list[list[Symbol]],
@@ -34,6 +168,8 @@ class Lines:
         global_multiplier: int = 1,
     ):
         """More efficient lines calculation"""
+        if len(config.paylines) >= COMPILED_PAYLINES_MIN_LINES:
+            return Lines.get_lines_compiled(board, config, wild_key, wild_sym, multiplier_method, global_multiplier)
         return_data = {
             "totalWin": 0,
             "wins": [],
@@ -44,11 +180,9 @@ class Lines:
             first_sym = board[0][line[0]]
             finished_wild_win = False if first_sym.check_attribute(wild_key) else True
             first_non_wild = first_sym if finished_wild_win else None
-            potential_line = [first_sym]
 
             wild_matches = 0 * (finished_wild_win) + 1 * (not (finished_wild_win))
             matches = 1 * (finished_wild_win) + 0 * (not (finished_wild_win))
-            base_win, wild_win = 0, 0
 
             for reel in range(1, len(line)):
                 sym = board[reel][line[reel]]
@@ -66,54 +200,53 @@ class Lines:
                         finished_wild_win = True
                     else:
                         break
-                potential_line.append(sym)
-
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
-            if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
-
-            if base_win > 0 or wild_win > 0:
-                if wild_win > base_win:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=wild_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
-                        potential_line[0].name,
-                        wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": wild_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
-                else:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, matches + wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=base_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
-                        first_non_wild.name,
-                        matches + wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": base_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
-
-                return_data["totalWin"] += line_win
-                return_data["wins"].append(win_dict)
+
+            Lines.add_line_win(
+                return_data,
+                board,
+                config,
+                line_index,
+                wild_matches,
+                wild_matches + matches,
+                first_non_wild.name if first_non_wild is not None else None,
+                wild_sym,
+                multiplier_method,
+                global_multiplier,
+            )
+
+        return return_data
+
+    @staticmethod
+    def get_lines_compiled(
+        board: list[list[Symbol]],
+        config: Config,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+        multiplier_method: str = "symbol",
+        global_multiplier: int = 1,
+    ):
+        """Same result as get_lines, evaluating all paylines at once with CompiledPaylines."""
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        for line_index, wild_matches, kind, has_first in get_compiled_paylines(config).evaluate(
+            board, wild_key, wild_sym
+        ):
+            line = config.paylines[line_index]
+            first_non_wild = board[wild_matches][line[wild_matches]].name if has_first else None
+            Lines.add_line_win(
+                return_data,
+                board,
+                config,
+                line_index,
+                wild_matches,
+                kind,
+                first_non_wild,
+                wild_sym,
+                multiplier_method,
+                global_multiplier,
+            )
 
         return return_data
 
@@ -0,0 +1,118 @@
+"""Precompiled reelstrip lookup tables, built once from the game configuration."""
+
+from typing import Dict, List
+
+
+class CompiledReelstrip:
+    """
+    Per-reel tables indexed by stop position for a single reelstrip.
+
+    windows[reel][stop]: visible symbol names, top_padding/bottom_padding[reel][stop]: padding symbol names,
+    special_positions[reel][stop]: (row, special_type) pairs in board scan order,
+    special_rows[reel][stop]: rows holding a special symbol, in board scan order,
+    special_counts[reel][stop]: {special_type: count} for the visible window.
+    """
+
+    def __init__(self, config: object, reelstrip: List[List[str]]):
+        self.reelstrip = reelstrip
+        self.special_symbols = config.special_symbols
+        self.symbol_stops = {}
+        self.window_stops = {}
+        self.count_ways = {}
+        self.windows = []
+        self.top_padding = []
+        self.bottom_padding = []
+        self.special_positions = []
+        self.special_rows = []
+        self.special_counts = []
+        for reel, strip in enumerate(reelstrip):
+            num_rows = config.num_rows[reel]
+            strip_length = len(strip)
+            windows, special_positions, special_rows, special_counts = [], [], [], []
+            for stop in range(strip_length):
+                window = tuple(strip[(stop + row) % strip_length] for row in range(num_rows))
+                positions = []
+                counts = {special_type: 0 for special_type in config.special_symbols}
+                for row, name in enumerate(window):
+                    for special_type, names in config.special_symbols.items():
+                        for special_name in names:
+                            if special_name == name:
+                                positions.append((row, special_type))
+                                counts[special_type] += 1
+                windows.append(window)
+                special_positions.append(tuple(positions))
+                special_rows.append(tuple(sorted({row for row, _ in positions})))
+                special_counts.append(counts)
+            self.windows.append(windows)
+            self.top_padding.append([strip[(stop - 1) % strip_length] for stop in range(strip_length)])
+            self.bottom_padding.append([strip[(stop + num_rows) % strip_length] for stop in range(strip_length)])
+            self.special_positions.append(special_positions)
+            self.special_rows.append(special_rows)
+            self.special_counts.append(special_counts)
+
+    def is_target(self, name: str, target: str) -> bool:
+        """Target is either a special symbol type (e.g 'scatter') or a symbol name."""
+        return (target in self.special_symbols and name in self.special_symbols[target]) or name == target
+
+    def get_symbol_stops(self, target: str) -> List[List[int]]:
+        """Strip positions holding the target on each reel, indexed once per target."""
+        if target not in self.symbol_stops:
+            self.symbol_stops[target] = [
+                [stop for stop, name in enumerate(strip) if self.is_target(name, target)] for strip in self.reelstrip
+            ]
+        return self.symbol_stops[target]
+
+    def get_window_stops(self, target: str) -> List[Dict[int, List[int]]]:
+        """For each reel, window start positions grouped by the number of targets visible in the window."""
+        if target not in self.window_stops:
+            window_stops = []
+            for windows in self.windows:
+                stops_by_count = {}
+                for stop, window in enumerate(windows):
+                    count = sum(1 for name in window if self.is_target(name, target))
+                    stops_by_count.setdefault(count, []).append(stop)
+                window_stops.append(stops_by_count)
+            self.window_stops[target] = window_stops
+        return self.window_stops[target]
+
+    def get_count_ways(self, target: str) -> List[Dict[int, int]]:
+        """
+        count_ways[reel][n]: number of stop combinations on reels reel..num_reels-1 showing exactly n targets.
+        count_ways[0][n] / (product of strip lengths) is the probability of n targets on a natural draw.
+        """
+        if target not in self.count_ways:
+            window_stops = self.get_window_stops(target)
+            count_ways = [{0: 1}]
+            for stops_by_count in reversed(window_stops):
+                ways = {}
+                for count, stops in stops_by_count.items():
+                    for total, num_ways in count_ways[0].items():
+                        ways[count + total] = ways.get(count + total, 0) + len(stops) * num_ways
+                count_ways.insert(0, ways)
+            self.count_ways[target] = count_ways
+        return self.count_ways[target]
+
+    def sample_window_stops(self, target: str, num_targets: int, rng: object) -> List[int]:
+        """
+        Draw one stop per reel, uniformly among all stop combinations showing exactly num_targets targets.
+        Reel by reel, the visible count is drawn proportional to the combinations that can still complete the total.
+        """
+        window_stops = self.get_window_stops(target)
+        count_ways = self.get_count_ways(target)
+        assert count_ways[0].get(num_targets, 0) > 0, f"Reelstrip cannot show exactly {num_targets} {target} symbols."
+        reel_positions = []
+        remaining = num_targets
+        for reel, stops_by_count in enumerate(window_stops):
+            draw = rng.randrange(count_ways[reel][remaining])
+            for count, stops in stops_by_count.items():
+                draw -= len(stops) * count_ways[reel + 1].get(remaining - count, 0)
+                if draw < 0:
+                    break
+            reel_positions.append(rng.choice(stops))
+            remaining -= count
+        return reel_positions
+
+
+def compile_reelstrips(config: object) -> Dict[str, CompiledReelstrip]:
+    """Compile every reelstrip defined in config.reels."""
+    return {reelstrip_id: CompiledReelstrip(config, reelstrip) for reelstrip_id, reelstrip in config.reels.items()}
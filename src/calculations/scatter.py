@@ -6,6 +6,70 @@ from src.calculations.symbol import Symbol
 from src.config.config import Config
 
 
+class ScatterBoardCounts:
+    """
+    Symbol counts for pay-anywhere evaluation, kept on the gamestate between tumbles.
+    count_board() counts a newly drawn board. After Tumble.tumble_board, update_from_tumble() removes the symbols
+    that exploded in the last evaluation and adds the refilled rows, so an evaluation after a tumble only costs the
+    size of the tumble. Positions are built with a single board scan, only when a symbol pays.
+    """
+
+    def __init__(self, config: Config, wild_key: str = "wild"):
+        self.wild_key = wild_key
+        self.wild_names = set(config.special_symbols[wild_key])
+        self.counts = {}
+        self.num_wilds = 0
+        self.exploding = {}
+
+    def add_symbol(self, name: str, amount: int = 1) -> None:
+        """Change the count of a symbol, dropping symbols no longer on the board."""
+        if name in self.wild_names:
+            self.num_wilds += amount
+        else:
+            count = self.counts.get(name, 0) + amount
+            if count > 0:
+                self.counts[name] = count
+            else:
+                del self.counts[name]
+
+    def count_board(self, board: list[list[Symbol]]) -> None:
+        """Count every symbol of a newly drawn board."""
+        self.counts, self.num_wilds, self.exploding = {}, 0, {}
+        for reel in board:
+            for symbol in reel:
+                self.add_symbol(symbol.name)
+
+    def set_exploding(self, board: list[list[Symbol]], positions: List[Dict]) -> None:
+        """Record the symbols exploded by an evaluation, removed again by the next update_from_tumble()."""
+        for p in positions:
+            self.exploding[(p["reel"], p["row"])] = board[p["reel"]][p["row"]].name
+
+    def update_from_tumble(self, board: list[list[Symbol]]) -> None:
+        """Apply the last tumble: exploded symbols are removed and the rows refilled at the top of each reel added."""
+        refilled_rows = [0] * len(board)
+        for (reel, _), name in self.exploding.items():
+            self.add_symbol(name, -1)
+            refilled_rows[reel] += 1
+        for reel, num_rows in enumerate(refilled_rows):
+            for symbol in board[reel][:num_rows]:
+                self.add_symbol(symbol.name)
+        self.exploding = {}
+
+    def get_paying_positions(self, board: list[list[Symbol]], paying_symbols: List[str]) -> tuple:
+        """Positions of the paying symbols and of all wilds, in board scan order."""
+        positions = {sym: [] for sym in paying_symbols}
+        wild_positions = []
+        wild_names = self.wild_names
+        for reel_idx, reel in enumerate(board):
+            for row_idx, symbol in enumerate(reel):
+                name = symbol.name
+                if name in wild_names:
+                    wild_positions.append({"reel": reel_idx, "row": row_idx})
+                elif name in positions:
+                    positions[name].append({"reel": reel_idx, "row": row_idx})
+        return positions, wild_positions
+
+
 class Scatter:
     """Collection of Scatter-pays functions."""
 
@@ -31,6 +95,89 @@ class Scatter:
 
         return (reel_to_overlay, row_to_overlay)
 
+    @staticmethod
+    def get_symbol_win(
+        config: Config,
+        board: list[list[Symbol]],
+        sym: str,
+        positions: List[Dict],
+        rows_for_overlay: List,
+        multiplier_key: str = "multiplier",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """Win data for a paying symbol (positions include wilds), marking its positions to explode."""
+        win_size = len(positions)
+        symbol_mult = 0
+        for p in positions:
+            if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
+                symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
+
+            board[p["reel"]][p["row"]].assign_attribute({"explode": True})
+
+        symbol_mult = max(symbol_mult, 1)
+        overlay_position = Scatter.get_central_scatter_position(rows_for_overlay, positions, len(board), len(board[0]))
+        rows_for_overlay.append(overlay_position[1])
+        return {
+            "symbol": sym,
+            "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
+            "positions": positions,
+            "meta": {
+                "globalMult": global_multiplier,
+                "clusterMult": symbol_mult,
+                "winWithoutMult": config.paytable[(win_size, sym)],
+                "overlay": {
+                    "reel": overlay_position[0],
+                    "row": overlay_position[1],
+                },
+            },
+        }
+
+    @staticmethod
+    def get_scatterpay_wins_incremental(
+        config: Config,
+        board: list[list[Symbol]],
+        board_counts: ScatterBoardCounts,
+        multiplier_key: str = "multiplier",
+        global_multiplier: int = 1,
+        verify: bool = False,
+    ) -> dict:
+        """
+        Same result as get_scatterpay_wins, using the symbol counts kept by board_counts, which must be up to date
+        with the board (see ScatterBoardCounts). verify=True checks the result against get_scatterpay_wins.
+        """
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        rows_for_overlay = []
+        total_win = 0.0
+        num_wilds = board_counts.num_wilds
+        paying_symbols = [
+            sym for sym, count in board_counts.counts.items() if (count + num_wilds, sym) in config.paytable
+        ]
+        if len(paying_symbols) > 0:
+            positions, wild_positions = board_counts.get_paying_positions(board, paying_symbols)
+            # get_scatterpay_wins orders wins by the first appearance of each symbol on the board
+            paying_symbols.sort(key=lambda sym: (positions[sym][0]["reel"], positions[sym][0]["row"]))
+            for sym in paying_symbols:
+                symbol_positions = positions[sym] + wild_positions
+                symbol_win_data = Scatter.get_symbol_win(
+                    config, board, sym, symbol_positions, rows_for_overlay, multiplier_key, global_multiplier
+                )
+                board_counts.set_exploding(board, symbol_positions)
+                total_win += symbol_win_data["win"]
+                return_data["wins"].append(symbol_win_data)
+
+        return_data["totalWin"] = total_win
+        if verify:
+            full_data = Scatter.get_scatterpay_wins(
+                config, board, board_counts.wild_key, multiplier_key, global_multiplier
+            )
+            if full_data != return_data:
+                raise RuntimeError("Incremental scatter-pay wins do not match a full board evaluation.")
+
+        return return_data
+
     @staticmethod
     def get_scatterpay_wins(
         config: Config,
@@ -61,32 +208,9 @@ class Scatter:
                 symbols_on_board[sym].extend(wild_positions)
             win_size = len(symbols_on_board[sym])
             if (win_size, sym) in config.paytable:
-                symbol_mult = 0
-                for p in symbols_on_board[sym]:
-                    if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
-                        symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
-
-                    board[p["reel"]][p["row"]].assign_attribute({"explode": True})
-
-                symbol_mult = max(symbol_mult, 1)
-                overlay_position = Scatter.get_central_scatter_position(
-                    rows_for_overlay, symbols_on_board[sym], len(board), len(board[0])
+                symbol_win_data = Scatter.get_symbol_win(
+                    config, board, sym, symbols_on_board[sym], rows_for_overlay, multiplier_key, global_multiplier
                 )
-                rows_for_overlay.append(overlay_position[1])
-                symbol_win_data = {
-                    "symbol": sym,
-                    "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
-                    "positions": symbols_on_board[sym],
-                    "meta": {
-                        "globalMult": global_multiplier,
-                        "clusterMult": symbol_mult,
-                        "winWithoutMult": config.paytable[(win_size, sym)],
-                        "overlay": {
-                            "reel": overlay_position[0],
-                            "row": overlay_position[1],
-                        },
-                    },
-                }
                 total_win += symbol_win_data["win"]
                 return_data["wins"].append(symbol_win_data)
 
@@ -1,20 +1,116 @@
 import random
+from bisect import bisect_left
+from itertools import accumulate
 from typing import Union
 
+MAX_CACHED_SAMPLERS = 1024
+_sampler_cache = {}
+_use_alias_sampling = False
+_check_sampler_distributions = False
+
+
+class WeightedSampler:
+    """
+    Precompiled weighted draws from a {value: weight} distribution.
+
+    sample() bisects a cumulative weight table, consuming a single random.uniform() call exactly as a linear
+    scan would, so outcomes for a given seed are unchanged. sample_alias() draws in O(1) from Vose alias tables
+    using a single random.random() call, giving a different (still seed-reproducible) sequence of outcomes.
+    """
+
+    def __init__(self, distribution: dict):
+        self.distribution = distribution
+        self.values = list(distribution.keys())
+        self.weights = tuple(distribution.values())
+        self.total_weight = sum(self.weights)
+        self.cumulative_weights = list(accumulate(self.weights, initial=0.0))[1:]
+        self.alias_probs, self.alias_index = None, None
+
+    def matches(self, distribution: dict) -> bool:
+        """True if distribution still holds the values and weights this sampler was built from."""
+        return self.weights == tuple(distribution.values()) and self.values == list(distribution)
+
+    def make_alias_tables(self, weights: list) -> tuple:
+        """Vose alias method: each column holds its own value with probability p, else its alias."""
+        num_values = len(weights)
+        scaled = [w * num_values / self.total_weight for w in weights]
+        alias_probs, alias_index = [1.0] * num_values, list(range(num_values))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            alias_probs[less], alias_index[less] = scaled[less], more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        return alias_probs, alias_index
+
+    def sample(self, total_weight: float = None) -> Union[float, int]:
+        """Draw a value, identical to scanning the distribution in order."""
+        if total_weight is None:
+            total_weight = self.total_weight
+        index = bisect_left(self.cumulative_weights, random.uniform(0, total_weight))
+        if index == len(self.values):
+            return Exception("error drawing item from distribution")
+        return self.values[index]
+
+    def sample_alias(self) -> Union[float, int]:
+        """Draw a value in constant time from the alias tables, built on the first alias draw."""
+        if self.alias_probs is None:
+            self.alias_probs, self.alias_index = self.make_alias_tables(list(self.weights))
+        roll = random.random() * len(self.values)
+        column = int(roll)
+        if roll - column < self.alias_probs[column]:
+            return self.values[column]
+        return self.values[self.alias_index[column]]
+
+
+def set_alias_sampling(enabled: bool) -> None:
+    """Opt in to O(1) alias draws for get_random_outcome(), this changes the outcomes drawn for each seed."""
+    global _use_alias_sampling
+    _use_alias_sampling = enabled
+
+
+def set_sampler_check(enabled: bool) -> None:
+    """Debug: raise if a distribution was changed in place without calling rebuild_sampler()."""
+    global _check_sampler_distributions
+    _check_sampler_distributions = enabled
+
+
+def rebuild_sampler(distribution: dict) -> WeightedSampler:
+    """Build and cache a new sampler for a distribution. Call after changing its values or weights in place."""
+    if len(_sampler_cache) >= MAX_CACHED_SAMPLERS:
+        _sampler_cache.clear()
+    sampler = WeightedSampler(distribution)
+    _sampler_cache[id(distribution)] = sampler
+    return sampler
+
+
+def get_sampler(distribution: dict) -> WeightedSampler:
+    """
+    Return the cached sampler for a distribution, keyed on identity. The cache holds a reference to each
+    distribution so ids are not reused. Samplers are not rebuilt when a distribution is changed in place,
+    use rebuild_sampler() (set_sampler_check() raises if this was missed).
+    """
+    sampler = _sampler_cache.get(id(distribution))
+    if sampler is None:
+        return rebuild_sampler(distribution)
+    if _check_sampler_distributions and not sampler.matches(distribution):
+        raise RuntimeError(
+            f"Distribution {distribution} was changed in place after it was sampled, call rebuild_sampler() first."
+        )
+    return sampler
+
 
 def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
     """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
     assert isinstance(distribution, dict), "distribution must be of type: dict "
-    if totalWeight is None:
-        totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
-    cumulative = 0.0
-    for value, weight in distribution.items():
-        cumulative += weight
-        if cumulative >= roll:
-            return value
-
-    return Exception("error drawing item from distribution")
+    sampler = get_sampler(distribution)
+    if _use_alias_sampling and totalWeight is None:
+        return sampler.sample_alias()
+    return sampler.sample(totalWeight)
 
 
 def get_mean_std_median(dist: dict) -> tuple[float, float, float]:
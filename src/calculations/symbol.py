@@ -1,32 +1,87 @@
 """Handle symbol classes and initial generation."""
 
-from typing import Dict
+from typing import Dict, List
 
 
 class SymbolStorage:
-    """Initial symbol generation from configuration file."""
+    """
+    Initial symbol generation from configuration file.
+    Stored symbols act as prototypes: special properties and paytable information are computed once per name,
+    and board symbols are shallow copies of the prototype. Prototypes in `symbols` are read-only, get_symbol()
+    and create_symbol_state() return independent copies.
+    """
 
     def __init__(self, config: object, all_symbols: list):
         self.config = config
         self.symbols: Dict[str, Symbol] = {}
+        self.symbol_ids: Dict[str, int] = {}
+        self.symbol_names: List[str] = []
         for symbol in all_symbols:
             self.symbols[symbol] = Symbol(self.config, symbol)
+        for symbol in sorted(all_symbols):
+            self.get_symbol_id(symbol)
 
     def create_symbol_state(self, symbol_name: str) -> object:
         """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        return self.get_prototype(symbol_name).copy()
 
     def get_symbol(self, name: str) -> object:
-        """Retrieve symbol class from name."""
+        """Retrieve a symbol class from name, as a copy so the stored prototype cannot be modified."""
+        return self.get_prototype(name).copy()
+
+    def get_prototype(self, name: str) -> object:
+        """Stored prototype for a symbol name, which must not be modified."""
         if name not in self.symbols:
             self.symbols[name] = Symbol(self.config, name)
         return self.symbols[name]
 
+    def get_symbol_id(self, name: str) -> int:
+        """Integer id used for a symbol name in encoded boards, ids are assigned in sorted name order."""
+        if name not in self.symbol_ids:
+            self.symbol_ids[name] = len(self.symbol_names)
+            self.symbol_names.append(name)
+        return self.symbol_ids[name]
+
+
+attribute_bits: Dict[str, int] = {}
+attribute_masks: Dict[tuple, int] = {}
+
+
+def get_attribute_bit(attribute: str) -> int:
+    """Bit assigned to an attribute name, allocated the first time the name is seen."""
+    bit = attribute_bits.get(attribute)
+    if bit is None:
+        bit = 1 << len(attribute_bits)
+        attribute_bits[attribute] = bit
+    return bit
+
+
+def get_attribute_mask(attributes: tuple) -> int:
+    """Combined bitmask for a tuple of attribute names."""
+    mask = attribute_masks.get(attributes)
+    if mask is None:
+        mask = 0
+        for attribute in attributes:
+            mask |= get_attribute_bit(attribute)
+        attribute_masks[attributes] = mask
+    return mask
+
 
 class Symbol:
-    """Create symbol from name (string) and assign relevant attributes and special functions."""
+    """
+    Create symbol from name (string) and assign relevant attributes and special functions.
+
+    Fixed properties are stored in __slots__, any other attribute (wild, scatter, multiplier, explode, ...)
+    is kept in the ordered `attributes` dict. `flags` holds one bit per attribute which is set and not False,
+    so check_attribute() is a single bit test.
+    """
+
+    __slots__ = ("name", "special_functions", "special", "is_paying", "paytable", "attributes", "flags")
+    slot_names = frozenset(__slots__)
 
     def __init__(self, config: object, name: str) -> None:
+        object.__setattr__(self, "attributes", {})
+        object.__setattr__(self, "flags", 0)
         self.name = name
         self.special_functions = []
         self.special = False
@@ -41,6 +96,53 @@ class Symbol:
 
         self.assign_paying_bool(config)
 
+    def __setattr__(self, attribute: str, value) -> None:
+        if attribute in Symbol.slot_names:
+            object.__setattr__(self, attribute, value)
+        else:
+            self.attributes[attribute] = value
+        if value is False:
+            object.__setattr__(self, "flags", self.flags & ~get_attribute_bit(attribute))
+        else:
+            object.__setattr__(self, "flags", self.flags | get_attribute_bit(attribute))
+
+    def __delattr__(self, attribute: str) -> None:
+        if attribute in Symbol.slot_names:
+            object.__delattr__(self, attribute)
+        elif attribute in self.attributes:
+            del self.attributes[attribute]
+        else:
+            raise AttributeError(f"'Symbol' object has no attribute '{attribute}'")
+        object.__setattr__(self, "flags", self.flags & ~get_attribute_bit(attribute))
+
+    def __getattr__(self, attribute: str):
+        """Only called for names which are not slots or methods."""
+        if attribute in Symbol.slot_names:
+            raise AttributeError(attribute)
+        try:
+            return self.attributes[attribute]
+        except KeyError:
+            raise AttributeError(f"'Symbol' object has no attribute '{attribute}'") from None
+
+    def __getstate__(self) -> dict:
+        return {slot: getattr(self, slot) for slot in Symbol.__slots__}
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+
+    def copy(self) -> object:
+        """Return an independent symbol state, without re-reading the config special symbols and paytable."""
+        symbol = Symbol.__new__(Symbol)
+        object.__setattr__(symbol, "name", self.name)
+        object.__setattr__(symbol, "special_functions", list(self.special_functions))
+        object.__setattr__(symbol, "special", self.special)
+        object.__setattr__(symbol, "is_paying", self.is_paying)
+        object.__setattr__(symbol, "paytable", self.paytable)
+        object.__setattr__(symbol, "attributes", dict(self.attributes))
+        object.__setattr__(symbol, "flags", self.flags)
+        return symbol
+
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
         self.special_functions.append(special_function)
@@ -72,10 +174,11 @@ class Symbol:
 
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
-        for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
-                return True
-        return False
+        return (self.flags & get_attribute_mask(args)) != 0
+
+    def get_attributes(self) -> dict:
+        """Ordered name: value mapping of all non-slot attributes."""
+        return self.attributes
 
     def get_attribute(self, attribute) -> type:
         """Return existing attribute value."""
@@ -29,71 +29,51 @@ class Ways:
             "wins": [],
         }
         assert multiplier_strategy in ["symbol", "board", "global"]
-        board_mult_count = 0
-        potential_wins = defaultdict()
-        wilds = [[] for _ in range(len(board))]
+        wild_names = config.special_symbols[wild_key]
+        # Per-reel count vectors, built in a single board pass. Symbol weights are the ways contribution of each
+        # symbol (multiplier values under the symbol strategy), board_mults the board strategy multiplier sums.
+        symbol_rows = [defaultdict(list) for _ in range(len(board))]
+        symbol_weights = [defaultdict(int) for _ in range(len(board))]
+        symbol_board_mults = [defaultdict(int) for _ in range(len(board))]
+        wild_rows = [[] for _ in range(len(board))]
+        wild_weights = [0] * len(board)
+        wild_board_mults = [0] * len(board)
+        wild_sym_mults = [0] * len(board)
         for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                sym = board[reel][row]
-                if reel == 0 and sym.name not in potential_wins:
-                    potential_wins[sym.name] = [[] for _ in range(len(board))]
-                    potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
-                elif sym.name in potential_wins:
-                    potential_wins[sym.name][reel].append({"reel": reel, "row": row})
-
-                if sym.name in config.special_symbols[wild_key]:
-                    wilds[reel].append({"reel": reel, "row": row})
-                    if board[reel][row].check_attribute(multiplier_key):
-                        wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
+            for row, sym in enumerate(board[reel]):
+                has_mult = sym.check_attribute(multiplier_key)
+                mult_val = sym.get_attribute(multiplier_key) if has_mult else None
+                if reel == 0 or sym.name in symbol_rows[0]:
+                    symbol_rows[reel][sym.name].append(row)
+                    if has_mult and multiplier_strategy == "symbol":
+                        symbol_weights[reel][sym.name] += mult_val
+                    else:
+                        symbol_weights[reel][sym.name] += 1
+                        if has_mult and multiplier_strategy == "board":
+                            symbol_board_mults[reel][sym.name] += mult_val * (mult_val > 1)
+
+                if sym.name in wild_names:
+                    wild_rows[reel].append((row, mult_val))
+                    if has_mult and multiplier_strategy in ["board", "symbol"]:
+                        wild_sym_mults[reel] += mult_val * (mult_val > 1)
+                        if multiplier_strategy == "board":
+                            wild_weights[reel] += 1
+                            wild_board_mults[reel] += mult_val * (mult_val > 1)
+                        else:
+                            wild_weights[reel] += mult_val
+                    else:
+                        wild_weights[reel] += 1
 
-        for symbol in potential_wins:
+        board_mult_count = 0
+        for symbol in symbol_rows[0]:
             kind, ways, cumulative_sym_mult = (0, 1, 0)
-            for reel, _ in enumerate(potential_wins[symbol]):
-                if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
+            for reel, _ in enumerate(board):
+                if symbol in symbol_rows[reel] or len(wild_rows[reel]) > 0:
                     kind += 1
-                    reel_sym_count = 0
                     # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
-                    symbols_have_mult = False
-                    for s in potential_wins[symbol][reel]:
-                        if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
-                            symbols_have_mult = True
-
-                    if symbols_have_mult is False:
-                        reel_sym_count += len(potential_wins[symbol][reel])
-                    else:
-                        reel_sym_count = 0
-                        for s in potential_wins[symbol][reel]:
-                            if (
-                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                and multiplier_strategy == "symbol"
-                            ):
-                                reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                            else:
-                                reel_sym_count += 1
-                                if (
-                                    board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                    and multiplier_strategy == "board"
-                                ):
-                                    gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                                    board_mult_count += gm * (gm > 1)
-
-                    if len(wilds[reel]) > 0:
-                        for sym in wilds[reel]:
-                            if board[sym["reel"]][sym["row"]].check_attribute(
-                                multiplier_key
-                            ) and multiplier_strategy in ["board", "symbol"]:
-                                wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
-                                cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
-                                if multiplier_strategy == "board":
-                                    reel_sym_count += 1
-                                    board_mult_count += wild_mult_val * (wild_mult_val > 1)
-                                else:
-                                    reel_sym_count += wild_mult_val
-                            else:
-                                reel_sym_count += 1
-
-                    ways *= reel_sym_count
-
+                    ways *= symbol_weights[reel].get(symbol, 0) + wild_weights[reel]
+                    board_mult_count += symbol_board_mults[reel].get(symbol, 0) + wild_board_mults[reel]
+                    cumulative_sym_mult += wild_sym_mults[reel]
                 else:
                     break
 
@@ -108,10 +88,12 @@ class Ways:
             if (kind, symbol) in config.paytable:
                 positions = []
                 for reel in range(kind):
-                    for pos in potential_wins[symbol][reel]:
-                        positions += [pos]
-                    for pos in wilds[reel]:
-                        positions += [pos]
+                    for row in symbol_rows[reel].get(symbol, []):
+                        positions += [{"reel": reel, "row": row}]
+                    for row, mult_val in wild_rows[reel]:
+                        positions += [{"reel": reel, "row": row}]
+                        if mult_val is not None:
+                            positions[-1][multiplier_key] = mult_val
 
                 win = round(config.paytable[kind, symbol] * ways, 2)
                 win_amt, multiplier = apply_mult(
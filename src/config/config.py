@@ -49,6 +49,36 @@ class Config:
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
 
         self.write_event_list = True
+        self.stream_books = False  # if True, books are written as they finish rather than held in gamestate.library
+        self.concatenate_book_shards = False  # if True, compressed book shards are joined as independent zstd frames
+
+        # Book compression: zstd level, worker threads used for the final books file (-1 uses all cores) and
+        # long-distance-matching window as log2(bytes), None disables. Windows above 27 require decoders to
+        # raise their maximum window size.
+        self.book_compression_level = 3
+        self.book_compression_threads = -1
+        self.book_ldm_window_log = None
+
+        # Train a zstd dictionary per mode from sampled books (written next to the published books as
+        # books_<mode>.zdict, consumers must load it to decompress).
+        self.train_book_dictionary = False
+        self.book_dictionary_samples = 2000
+        self.book_dictionary_size = 112640
+
+        # If set, published books are written in independently compressed blocks of this many books, with a
+        # books_<mode>.index.json sidecar for random access (see utils/indexed_books.py).
+        self.book_index_block_size = None
+
+        self.write_binary_lookups = False  # if True, lookUpTable CSVs are also written as memory-mappable .npy tables
+        self.alias_sampling = False  # if True, weighted draws use O(1) alias tables (changes outcomes per seed)
+        self.check_sampler_distributions = False  # debug: raise if a distribution changed without rebuild_sampler()
+        self.encode_board = False  # opt-in: drawn boards are also copied to integer symbol-id arrays (board_ids)
+        # Forced (e.g freegame trigger) boards: "rejection" redraws until the target count is met, "direct" draws
+        # valid stops in one pass using per-stop symbol indexes, "exact" draws from the exact per-reel count
+        # distributions and allows stacked targets ("direct" and "exact" change outcomes per seed).
+        self.force_board_sampler = "rejection"
+        self.snapshot_tumble_board = False  # if True, tumble_board stores a copy of the board as board_before_tumble
+        self.check_event_aliasing = False  # debug: raise if a book event is modified after it was added
 
         self.bet_modes = []
         self.opt_params = {None: None}
@@ -156,6 +156,14 @@ class OutputFiles:
             raise RuntimeError("Logic error in name generation.")
         return os.path.join(self.compressed_path if compress else self.book_path, filename)
 
+    def get_book_dictionary_name(self, betmode: str):
+        """Trained zstd dictionary required to decompress books, published alongside them."""
+        return os.path.join(self.compressed_path, f"books_{betmode}.zdict")
+
+    def get_book_index_name(self, betmode: str):
+        """Sidecar block index for random access into compressed books."""
+        return os.path.join(self.compressed_path, f"books_{betmode}.index.json")
+
     def get_final_lookup_name(self, betmode: str):
         """Final csv lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTable_{betmode}.csv")
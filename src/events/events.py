@@ -1,45 +1,79 @@
 """Defines reusable events"""
 
-from copy import deepcopy
+from src.calculations.symbol import get_attribute_mask
 from src.events.event_constants import EventConstants
 
 
+def copy_payload(value):
+    """Copy nested lists and dicts for an event payload. Faster than deepcopy for JSON-ready data."""
+    if isinstance(value, dict):
+        return {key: copy_payload(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [copy_payload(val) for val in value]
+    return value
+
+
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
+    attrs = symbol.get_attributes()
     for key, val in attrs.items():
         if key in special_attributes and symbol.get_attribute(key) != False:
             print_sym[key] = val
     return print_sym
 
 
+def compact_sym(symbol: object, special_attributes: list, special_mask: int):
+    """
+    Compact record of a symbol for lazily built events: the symbol name, or the json_ready_sym dict if any
+    special attribute is set. Expanded by json_sym_from_compact when the book is written.
+    """
+    if symbol.flags & special_mask:
+        return json_ready_sym(symbol, special_attributes)
+    return symbol.name
+
+
+def json_sym_from_compact(symbol) -> dict:
+    """JSON symbol from a compact_sym record."""
+    if isinstance(symbol, str):
+        return {"name": symbol}
+    return symbol
+
+
+def build_reveal_event(index: int, board: list, padding_positions: list, game_type: str, anticipation: list) -> dict:
+    """JSON reveal event from a board of compact_sym records."""
+    return {
+        "index": index,
+        "type": EventConstants.REVEAL.value,
+        "board": [[json_sym_from_compact(symbol) for symbol in reel] for reel in board],
+        "paddingPositions": padding_positions,
+        "gameType": game_type,
+        "anticipation": anticipation,
+    }
+
+
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
-    board_client = []
     special_attributes = list(gamestate.config.special_symbols.keys())
-    for reel, _ in enumerate(gamestate.board):
-        board_client.append([])
-        for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
+    special_mask = get_attribute_mask(tuple(special_attributes))
+    board_client = [
+        [compact_sym(symbol, special_attributes, special_mask) for symbol in reel] for reel in gamestate.board
+    ]
 
     if gamestate.config.include_padding:
         for reel, _ in enumerate(board_client):
-            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[
-                reel
-            ]
-            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+            board_client[reel].insert(0, compact_sym(gamestate.top_symbols[reel], special_attributes, special_mask))
+            board_client[reel].append(compact_sym(gamestate.bottom_symbols[reel], special_attributes, special_mask))
 
-    event = {
-        "index": len(gamestate.book.events),
-        "type": EventConstants.REVEAL.value,
-        "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
-        "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
-    }
-    gamestate.book.add_event(event)
+    gamestate.book.add_lazy_event(
+        build_reveal_event,
+        len(gamestate.book.events),
+        board_client,
+        list(gamestate.reel_positions),
+        gamestate.gametype,
+        list(gamestate.anticipation),
+    )
 
 
 def fs_trigger_event(
@@ -51,9 +85,7 @@ def fs_trigger_event(
     """Triggers feature game from the basegame."""
     assert basegame_trigger != freegame_trigger, "must set either basegame_trigger or freeSpinTrigger to = True"
     event = {}
-    scatter_positions = []
-    for reel, _ in enumerate(gamestate.special_syms_on_board["scatter"]):
-        scatter_positions.append(gamestate.special_syms_on_board["scatter"][reel])
+    scatter_positions = copy_payload(gamestate.special_syms_on_board["scatter"])
     if include_padding_index:
         for pos in scatter_positions:
             pos["row"] += 1
@@ -134,12 +166,10 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
-def win_info_event(gamestate, include_padding_index=True):
-    """
-    include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
-    """
+def build_win_info_event(index: int, total_win: int, wins: list, wincap: float, include_padding_index: bool) -> dict:
+    """JSON win info event, copying the recorded wins so the gamestate win data is left unchanged."""
     win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
+    win_data_copy["wins"] = copy_payload(wins)
     for idx, w in enumerate(win_data_copy["wins"]):
         if include_padding_index:
             new_positions = []
@@ -148,29 +178,42 @@ def win_info_event(gamestate, include_padding_index=True):
         else:
             new_positions = w["positions"]
 
-        win_data_copy["wins"][idx]["win"] = int(
-            round(min(win_data_copy["wins"][idx]["win"], gamestate.config.wincap) * 100, 0)
-        )
+        win_data_copy["wins"][idx]["win"] = int(round(min(win_data_copy["wins"][idx]["win"], wincap) * 100, 0))
         win_data_copy["wins"][idx]["positions"] = new_positions
         if "meta" in win_data_copy["wins"][idx]:
             win_data_copy["wins"][idx]["meta"]["winWithoutMult"] = int(
                 int(
                     min(
                         win_data_copy["wins"][idx]["meta"]["winWithoutMult"] * 100,
-                        gamestate.config.wincap * 100,
+                        wincap * 100,
                     ),
                 )
             )
             if "overlay" in win_data_copy["wins"][idx]["meta"] and include_padding_index:
                 win_data_copy["wins"][idx]["meta"]["overlay"]["row"] += 1
 
-    event = {
-        "index": len(gamestate.book.events),
+    return {
+        "index": index,
         "type": EventConstants.WIN_DATA.value,
-        "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
+        "totalWin": total_win,
         "wins": win_data_copy["wins"],
     }
-    gamestate.book.add_event(event)
+
+
+def win_info_event(gamestate, include_padding_index=True):
+    """
+    include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
+    The wins list and each win dict are copied when the event is emitted, nested positions and meta values are shared
+    with gamestate.win_data and must not be modified in place afterwards.
+    """
+    gamestate.book.add_lazy_event(
+        build_win_info_event,
+        len(gamestate.book.events),
+        int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
+        [dict(win) for win in gamestate.win_data["wins"]],
+        gamestate.config.wincap,
+        include_padding_index,
+    )
 
 
 def update_tumble_win_event(gamestate):
@@ -226,9 +269,20 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+def build_tumble_board_event(index: int, new_symbols: list, exploding: list) -> dict:
+    """JSON tumble event from new symbols as compact_sym records."""
+    return {
+        "index": index,
+        "type": EventConstants.TUMBLE_BOARD.value,
+        "newSymbols": [[json_sym_from_compact(symbol) for symbol in reel] for reel in new_symbols],
+        "explodingSymbols": exploding,
+    }
+
+
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
     special_attributes = list(gamestate.config.special_symbols.keys())
+    special_mask = get_attribute_mask(tuple(special_attributes))
 
     exploding = []
     for win in gamestate.win_data["wins"]:
@@ -243,15 +297,11 @@ def tumble_board_event(gamestate):
     new_symbols = [[] for _ in range(gamestate.config.num_reels)]
     for r, _ in enumerate(gamestate.new_symbols_from_tumble):
         if len(gamestate.new_symbols_from_tumble[r]) > 0:
-            new_symbols[r] = [json_ready_sym(s, special_attributes) for s in gamestate.new_symbols_from_tumble[r]]
+            new_symbols[r] = [
+                compact_sym(s, special_attributes, special_mask) for s in gamestate.new_symbols_from_tumble[r]
+            ]
 
-    event = {
-        "index": len(gamestate.book.events),
-        "type": EventConstants.TUMBLE_BOARD.value,
-        "newSymbols": new_symbols,
-        "explodingSymbols": exploding,
-    }
-    gamestate.book.add_event(event)
+    gamestate.book.add_lazy_event(build_tumble_board_event, len(gamestate.book.events), new_symbols, exploding)
 
 
 def enter_bonus_event(gamestate) -> None:
@@ -1,6 +1,26 @@
 "Handles independent simulation events and details."
 
 from copy import deepcopy
+from typing import Callable, NamedTuple
+
+_check_event_aliasing = False
+
+
+def set_event_alias_check(enabled: bool) -> None:
+    """Debug mode: snapshot every event as it is added and raise if it changes before the book is written."""
+    global _check_event_aliasing
+    _check_event_aliasing = enabled
+
+
+class LazyEvent(NamedTuple):
+    """Compact event record, converted to its JSON dict by builder(*args) only when the book is written."""
+
+    builder: Callable
+    args: tuple
+
+    def build(self) -> dict:
+        "Return the JSON-ready event."
+        return self.builder(*self.args)
 
 
 class Book:
@@ -11,25 +31,69 @@ class Book:
         self.id = book_id
         self.payout_multiplier = 0.0
         self.events = []
+        self.event_snapshots = []
         self.criteria = criteria
         self.basegame_wins = 0.0
         self.freegame_wins = 0.0
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        """
+        Append event to book. Events are stored as passed, so they must not share containers with the gamestate
+        (build them fresh, or use events.copy_payload).
+        """
+        self.events.append(event)
+        if _check_event_aliasing:
+            self.event_snapshots.append(deepcopy(event))
+
+    def add_lazy_event(self, builder: Callable, *args):
+        """
+        Append an event as a LazyEvent record, builder(*args) is only called if the book is written.
+        Arguments follow the same rule as add_event and must not be modified after the event is added.
+        """
+        self.add_event(LazyEvent(builder, args))
+
+    def get_event(self, event_id: int) -> dict:
+        "Return the event at position 'event_id', building it first if it was added lazily."
+        event = self.events[event_id]
+        if isinstance(event, LazyEvent):
+            event = event.build()
+            self.events[event_id] = event
+            if _check_event_aliasing:
+                self.event_snapshots[event_id] = self.event_snapshots[event_id].build()
+        return event
+
+    def build_events(self) -> list:
+        "Build all lazily added events, returning the list of JSON-ready events."
+        for event_id, event in enumerate(self.events):
+            if isinstance(event, LazyEvent):
+                self.get_event(event_id)
+        return self.events
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
+        event = self.get_event(event_id)
         for k, v in appended_info.items():
-            self.events[event_id][k] = v
+            event[k] = v
+            if _check_event_aliasing:
+                self.event_snapshots[event_id][k] = deepcopy(v)
+
+    def check_events(self) -> None:
+        "Raise if any event was modified after being added, i.e. it shares a container with the gamestate."
+        for event, snapshot in zip(self.build_events(), self.event_snapshots):
+            if event != snapshot:
+                raise RuntimeError(
+                    f"Event {snapshot.get('index')} ({snapshot.get('type')}) in book {self.id} was modified after it "
+                    "was added. Copy gamestate-owned lists and dicts before passing them to add_event."
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if _check_event_aliasing:
+            self.check_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
-            "events": self.events,
+            "events": self.build_events(),
             "criteria": self.criteria,
             "baseGameWins": self.basegame_wins,
             "freeGameWins": self.freegame_wins,
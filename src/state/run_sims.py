@@ -1,13 +1,16 @@
 import time
 import random
-from multiprocessing import Process, Manager
+import pickle
+from multiprocessing import Process, Manager, Queue
 import cProfile
 from warnings import warn
 import shutil
+import queue
 import asyncio
-from typing import Dict
+import traceback
+from typing import Dict, List
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.write_data import output_lookup_and_force_files, train_book_dictionary
 
 
 def create_books(
@@ -18,8 +21,16 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    use_worker_pool: bool = False,
+    sim_chunk_size: int = None,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """Main run-function for simulating game outcomes and outputting all files.
+
+    use_worker_pool: start `threads` long-lived worker processes once for all bet-modes, rather than
+    forking new processes and a multiprocessing Manager for every batch. Ignored when threads = 1.
+    sim_chunk_size: (worker pool only) split every thread and batch range into chunks of this size, handed out to
+    idle workers on demand. Outputs are identical to the static split.
+    """
     for key, ns in num_sim_args.items():
         if all([ns > 0, ns > batch_size * batch_size]):
             assert (
@@ -32,23 +43,46 @@ def create_books(
 
     if profiling and threads > 1:
         raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
+    if profiling and use_worker_pool:
+        raise RuntimeError("Profiling is not supported with the worker pool, set use_worker_pool = False")
+    if sim_chunk_size is not None:
+        assert use_worker_pool, "sim_chunk_size requires use_worker_pool = True"
+        assert sim_chunk_size > 0, "sim_chunk_size must be a positive integer"
 
     startTime = time.time()
     print("\nCreating books...")
+    pool = SimulationPool(gamestate, threads) if use_worker_pool and threads > 1 else None
     for betmode_name in num_sim_args:
         if num_sim_args[betmode_name] > 0:
             gamestate.betmode = betmode_name
-            run_multi_process_sims(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=num_sim_args[betmode_name],
-                compress=compress,
-                write_event_list=config.write_event_list,
-                profiling=profiling,
-            )
+            if compress and config.train_book_dictionary:
+                make_book_dictionary(gamestate, betmode_name, num_sim_args[betmode_name])
+            shard_indices = None
+            if pool is not None:
+                shard_indices = run_pooled_sims(
+                    pool,
+                    threads,
+                    batch_size,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    num_sims=num_sim_args[betmode_name],
+                    compress=compress,
+                    write_event_list=config.write_event_list,
+                    sim_chunk_size=sim_chunk_size,
+                )
+            else:
+                run_multi_process_sims(
+                    threads,
+                    batch_size,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    num_sims=num_sim_args[betmode_name],
+                    compress=compress,
+                    write_event_list=config.write_event_list,
+                    profiling=profiling,
+                )
             output_lookup_and_force_files(
                 threads,
                 batch_size,
@@ -57,7 +91,10 @@ def create_books(
                 gamestate,
                 num_sims=num_sim_args[betmode_name],
                 compress=compress,
+                shard_indices=shard_indices,
             )  # , write_event_list=config.write_event_list)
+    if pool is not None:
+        pool.close()
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
 
@@ -88,6 +125,25 @@ def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[in
     return {i: simAllocation[i] for i in range(min(sims, len(simAllocation)))}
 
 
+def sample_and_train_dictionary(gamestate: object, betmode: str, num_sims: int) -> None:
+    """Train the mode's zstd book dictionary from simulations spread evenly across all criteria."""
+    num_samples = min(gamestate.config.book_dictionary_samples, num_sims)
+    sim_allocation = assign_sim_criteria(get_sim_splits(gamestate, num_sims, betmode), num_sims)
+    sample_sims = sorted(set(int(i * num_sims / num_samples) for i in range(num_samples)))
+    books = gamestate.sample_books(betmode, sim_allocation, sample_sims)
+    train_book_dictionary(gamestate, betmode, books)
+
+
+def make_book_dictionary(gamestate: object, betmode: str, num_sims: int) -> None:
+    """Sample books in a separate process, so no game state from the samples is carried into the real run."""
+    print("Training book dictionary for", betmode)
+    process = Process(target=sample_and_train_dictionary, args=(gamestate, betmode, num_sims))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Book dictionary training failed for {betmode}")
+
+
 async def profile_and_visualize(
     game_id,
     gamestate,
@@ -189,3 +245,175 @@ def run_multi_process_sims(
             print("Finished joining threads.")
             gamestate.combine(all_betmode_configs, betmode)
             gamestate.get_betmode(betmode).lock_force_keys()
+
+
+def pool_worker(clean_gamestate: object, task_queue: Queue, result_queue: Queue) -> None:
+    """
+    Worker loop, runs simulation ranges until a stop signal (None) is received.
+    Every task starts from a copy of the untouched gamestate, as a freshly forked process would.
+    """
+    clean_state = pickle.dumps(clean_gamestate)  # unpickling a copy is much faster than deepcopy for a gamestate
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        try:
+            gamestate = pickle.loads(clean_state)
+            gamestate.recorded_events = {}
+            gamestate.run_sim_range(
+                task["betmode"],
+                task["sim_to_criteria"],
+                range(task["sim_start"], task["sim_end"]),
+                task["thread_index"],
+                task["repeat_count"],
+                compress=task["compress"],
+                write_event_list=task["write_event_list"],
+                print_rtp=task["print_rtp"],
+            )
+            result_queue.put(
+                {
+                    "task_index": task["task_index"],
+                    "total_wins": gamestate.win_manager.total_cumulative_wins,
+                    "base_wins": gamestate.win_manager.cumulative_base_wins,
+                    "free_wins": gamestate.win_manager.cumulative_free_wins,
+                    "force_keys": list(gamestate.get_betmode(task["betmode"]).get_force_keys()),
+                }
+            )
+        except Exception:  # pylint: disable=broad-except
+            result_queue.put({"error": traceback.format_exc()})
+
+
+class SimulationPool:
+    """Long-lived simulation processes fed from a shared task queue.
+
+    Each worker receives a copy of the gamestate once, when the pool is started, and copies it again for every
+    task. Simulation ranges are pulled from the task queue, so no processes are created or joined between batches.
+    """
+
+    poll_interval = 5  # seconds between checks that all workers are still running while waiting for results
+
+    def __init__(self, gamestate: object, threads: int):
+        self.task_queue = Queue()
+        self.result_queue = Queue()
+        self.workers = []
+        for _ in range(threads):
+            process = Process(target=pool_worker, args=(gamestate, self.task_queue, self.result_queue), daemon=True)
+            process.start()
+            self.workers.append(process)
+        print("Started", threads, "pool workers.")
+
+    def get_result(self) -> dict:
+        """Wait for the next result, raising if a worker failed or exited without returning one."""
+        while True:
+            try:
+                result = self.result_queue.get(timeout=self.poll_interval)
+                break
+            except queue.Empty:
+                exit_codes = [process.exitcode for process in self.workers if not process.is_alive()]
+                if exit_codes:
+                    self.close(force=True)
+                    raise RuntimeError(f"Simulation worker exited unexpectedly with exit code {exit_codes[0]}")
+        if "error" in result:
+            self.close(force=True)
+            raise RuntimeError(f"Simulation worker failed:\n{result['error']}")
+        return result
+
+    def run_tasks(self, tasks: List[dict]) -> List[dict]:
+        """
+        Queue all tasks and block until every result has been returned. Tasks are independent and are picked up
+        by any idle worker in queue order. Returns results in the same order as tasks.
+        """
+        for task_index, task in enumerate(tasks):
+            self.task_queue.put({**task, "task_index": task_index})
+        results = [None] * len(tasks)
+        for _ in range(len(tasks)):
+            result = self.get_result()
+            results[result.pop("task_index")] = result
+        return results
+
+    def close(self, force: bool = False) -> None:
+        """Signal all workers to stop and wait for them to exit."""
+        for process in self.workers:
+            if force:
+                process.terminate()
+            else:
+                self.task_queue.put(None)
+        for process in self.workers:
+            process.join()
+        self.workers = []
+
+
+def run_pooled_sims(
+    pool: SimulationPool,
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    write_event_list: bool = False,
+    sim_chunk_size: int = None,
+) -> List[tuple]:
+    """
+    Run all game-mode simulations on an existing worker pool.
+
+    Simulations are split into the same (thread, batch) ranges as run_multi_process_sims, each run from a clean
+    gamestate. With sim_chunk_size every range is further split into chunks of that size. Simulations only depend
+    on their own seed (games reset per-simulation state in reset_book), so chunks are independent tasks and idle
+    workers pick up any of them, so ranges with many repeated simulations do not hold up a whole batch.
+
+    Returns the ordered (thread_index, repeat_count, continues_previous) shards of the temporary files written,
+    continues_previous is True for chunks after the first one of a range.
+    """
+    print("\nCreating books for", game_id, "in", betmode)
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    sims_per_thread = int(num_sims / threads / num_repeats)
+    num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
+    sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims)
+    total_sims = sims_per_thread * threads * num_repeats
+    chunk_size = sims_per_thread if sim_chunk_size is None else sim_chunk_size
+
+    tasks, shards = [], []
+    for repeat in range(num_repeats):
+        for thread in range(threads):
+            range_start = thread * sims_per_thread + (threads * sims_per_thread) * repeat
+            for sim_start in range(range_start, range_start + sims_per_thread, chunk_size):
+                sim_end = min(sim_start + chunk_size, range_start + sims_per_thread)
+                # chunks are named by their position in simulation order, ranges keep the run_multi_process_sims names
+                shard = (thread, repeat) if sim_chunk_size is None else (0, len(shards))
+                shards.append((*shard, sim_start > range_start))
+                tasks.append(
+                    {
+                        "betmode": betmode,
+                        "sim_to_criteria": {sim: sim_allocation[sim] for sim in range(sim_start, sim_end)},
+                        "sim_start": sim_start,
+                        "sim_end": sim_end,
+                        "thread_index": shard[0],
+                        "repeat_count": shard[1],
+                        "compress": compress,
+                        "write_event_list": write_event_list,
+                        "print_rtp": sim_chunk_size is None,
+                    }
+                )
+    results = pool.run_tasks(tasks)
+
+    mode = gamestate.get_betmode(betmode)
+    for result in results:
+        for key in result["force_keys"]:
+            if key not in mode.get_force_keys():
+                mode.add_force_key(key)
+    mode.lock_force_keys()
+
+    mode_cost = mode.get_cost()
+    print(
+        "Mode",
+        betmode,
+        "finished with",
+        round(sum(r["total_wins"] for r in results) / (total_sims * mode_cost), 3),
+        "RTP.",
+        f"[baseGame: {round(sum(r['base_wins'] for r in results)/(total_sims*mode_cost), 3)}, freeGame: {round(sum(r['free_wins'] for r in results)/(total_sims*mode_cost), 3)}]",
+        flush=True,
+    )
+
+    return shards
@@ -6,14 +6,18 @@ import random
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
+from src.calculations.statistics import set_alias_sampling, set_sampler_check
+from src.calculations.reelstrip import compile_reelstrips
 from src.config.output_filenames import OutputFiles
-from src.state.books import Book
+from src.state.books import Book, set_event_alias_check
+from src.write_data.book_writer import BookStreamWriter
 from src.write_data.write_data import (
     print_recorded_wins,
     make_lookup_tables,
     write_json,
     make_lookup_pay_split,
     write_library_events,
+    write_event_items,
 )
 
 
@@ -23,12 +27,18 @@ class GeneralGameState(ABC):
     def __init__(self, config):
         self.config = config
         self.output_files = OutputFiles(self.config)
+        set_alias_sampling(self.config.alias_sampling)
+        set_sampler_check(self.config.check_sampler_distributions)
+        set_event_alias_check(self.config.check_event_aliasing)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
+        self.book_writer = None
         self.recorded_events = {}
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.encoded_reels = {}
+        self.compiled_reels = compile_reelstrips(self.config)
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
@@ -179,7 +189,10 @@ class GeneralGameState(ABC):
                     "bookIds": [book_id],
                 }
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        if self.book_writer is not None:
+            self.book_writer.write_book(self.book.to_json())
+        else:
+            self.library[self.sim + 1] = copy(self.book.to_json())
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -243,26 +256,72 @@ class GeneralGameState(ABC):
         write_event_list=True,
     ) -> None:
         """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        sim_start = thread_index * num_sims + (total_threads * num_sims) * repeat_count
+        self.run_sim_range(
+            betmode,
+            sim_to_criteria,
+            range(sim_start, sim_start + num_sims),
+            thread_index,
+            repeat_count,
+            compress=compress,
+            write_event_list=write_event_list,
+        )
+        betmode_copy_list.append(self.config.bet_modes)
+
+    def sample_books(self, betmode, sim_to_criteria, sims) -> list:
+        """Run simulations in memory and return their books without writing any output files."""
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
         self.betmode = betmode
-        self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
+        self.num_sims = len(sims)
+        for sim in sims:
+            self.criteria = sim_to_criteria[sim]
+            self.run_spin(sim)
+        return list(self.library.values())
+
+    def run_sim_range(
+        self,
+        betmode,
+        sim_to_criteria,
+        sims,
+        thread_index,
+        repeat_count,
+        compress=True,
+        write_event_list=True,
+        print_rtp=True,
+    ) -> None:
+        """Run a range of simulation numbers and write the temporary book, force and lookup files for that range."""
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.library = {}
+        self.betmode = betmode
+        self.num_sims = len(sims)
+        if self.config.stream_books:
+            self.book_writer = BookStreamWriter(
+                self, betmode, thread_index, repeat_count, compress=compress, write_event_list=write_event_list
+            )
+        for sim in sims:
             self.criteria = sim_to_criteria[sim]
             self.run_spin(sim)
         mode_cost = self.get_current_betmode().get_cost()
+        num_sims = self.num_sims
+
+        if print_rtp:
+            print(
+                "Thread " + str(thread_index),
+                "finished with",
+                round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
+                "RTP.",
+                f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
+                flush=True,
+            )
 
-        print(
-            "Thread " + str(thread_index),
-            "finished with",
-            round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
-            "RTP.",
-            f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
-            flush=True,
-        )
+        if self.book_writer is not None:
+            self.book_writer.close()
+            print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
+            if write_event_list:
+                write_event_items(self, self.book_writer.event_items, betmode)
+            self.book_writer = None
+            return
 
         write_json(
             self,
@@ -276,4 +335,3 @@ class GeneralGameState(ABC):
 
         if write_event_list:
             write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
@@ -0,0 +1,79 @@
+"""Binary lookup tables, written next to lookUpTable CSV files and memory-mapped by readers."""
+
+import os
+import json
+import hashlib
+import numpy as np
+
+LOOKUP_DTYPE = np.dtype([("id", "<u4"), ("weight", "<u8"), ("payout", "<u8")])
+
+
+def get_binary_lookup_name(csv_name: str) -> str:
+    """Binary table name for a lookUpTable_<mode>.csv file."""
+    return os.path.splitext(str(csv_name))[0] + ".npy"
+
+
+def get_binary_lookup_source_name(csv_name: str) -> str:
+    """Sidecar recording the size, modification time and hash of the CSV a binary table was written from."""
+    return os.path.splitext(str(csv_name))[0] + ".npy.json"
+
+
+def get_csv_sha256(csv_name: str) -> str:
+    """sha256 of a lookup CSV."""
+    sha256 = hashlib.sha256()
+    with open(csv_name, "rb") as f:
+        for data in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+def write_csv_source(csv_name: str, sha256: str) -> None:
+    """Record the current size and modification time of a lookup CSV, with the hash of its contents."""
+    stat = os.stat(csv_name)
+    with open(get_binary_lookup_source_name(csv_name), "w", encoding="UTF-8") as f:
+        json.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}, f)
+
+
+def write_binary_lookup(csv_name: str) -> str:
+    """Convert an id,weight,payout lookup table to little-endian id (uint32), weight and payout (uint64) columns."""
+    table = np.loadtxt(csv_name, delimiter=",", dtype=np.uint64, ndmin=2)
+    lookup = np.zeros(len(table), dtype=LOOKUP_DTYPE)
+    if len(table) > 0:
+        assert int(table[:, 0].max()) <= np.iinfo(np.uint32).max, "Book ids must fit in uint32."
+        lookup["id"] = table[:, 0]
+        lookup["weight"] = table[:, 1]
+        lookup["payout"] = table[:, 2]
+    binary_name = get_binary_lookup_name(csv_name)
+    np.save(binary_name, lookup)
+    write_csv_source(csv_name, get_csv_sha256(csv_name))
+    return binary_name
+
+
+def load_binary_lookup(csv_name: str, verify: bool = False):
+    """
+    Memory-map the binary table for a lookup CSV, if one exists and the CSV has the size and modification time
+    recorded in the sidecar. Returns None otherwise, so callers fall back to parsing the CSV. If the CSV itself is
+    missing the binary table is used as is.
+    verify=True compares the sha256 of the CSV instead, and records the new modification time if the contents
+    match (e.g. after the files were copied or checked out).
+    """
+    binary_name = get_binary_lookup_name(csv_name)
+    if not os.path.exists(binary_name):
+        return None
+    if os.path.exists(csv_name):
+        source_name = get_binary_lookup_source_name(csv_name)
+        if not os.path.exists(source_name):
+            return None
+        with open(source_name, "r", encoding="UTF-8") as f:
+            source = json.load(f)
+        stat = os.stat(csv_name)
+        if source.get("size") != stat.st_size:
+            return None
+        if verify:
+            if source.get("sha256") != get_csv_sha256(csv_name):
+                return None
+            if source.get("mtime_ns") != stat.st_mtime_ns:
+                write_csv_source(csv_name, source["sha256"])
+        elif source.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+    return np.load(binary_name, mmap_mode="r")
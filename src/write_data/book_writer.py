@@ -0,0 +1,76 @@
+"""Stream finished simulation books to temporary output files as they are created."""
+
+import json
+
+from src.write_data.write_data import (
+    lookup_row,
+    pay_split_row,
+    add_unique_events,
+    get_book_compressor,
+    load_book_dictionary,
+)
+
+
+class BookStreamWriter:
+    """
+    Incrementally write books, lookup table rows and pay-split rows for a single simulation range.
+    Books are serialized (and compressed) as soon as they are imprinted, so memory use does not grow
+    with the number of simulations. Output files match those produced from gamestate.library.
+    """
+
+    def __init__(
+        self,
+        gamestate: object,
+        betmode: str,
+        thread_index: int,
+        repeat_count: int,
+        compress: bool = True,
+        write_event_list: bool = True,
+    ):
+        output_files = gamestate.output_files
+        self.book_name = output_files.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress)
+        self.compressed = self.book_name.endswith(".zst")
+        self.regular_json = not self.compressed and gamestate.config.output_regular_json
+        self.write_event_list = write_event_list
+        self.event_items = {}
+        self.num_books = 0
+
+        if self.compressed:
+            compressor = get_book_compressor(
+                gamestate.config, threads=0, dict_data=load_book_dictionary(gamestate, betmode)
+            )
+            self.book_file = compressor.stream_writer(open(self.book_name, "wb"))
+        else:
+            self.book_file = open(self.book_name, "w", encoding="UTF-8")
+            if self.regular_json:
+                self.book_file.write("[")
+
+        self.lookup_file = open(
+            output_files.get_temp_lookup_name(betmode, thread_index, repeat_count), "w", encoding="UTF-8"
+        )
+        self.pay_split_file = open(
+            output_files.get_temp_segmented_name(betmode, thread_index, repeat_count), "w", encoding="UTF-8"
+        )
+
+    def write_book(self, book: dict) -> None:
+        """Serialize a JSON-ready book and append lookup and pay-split rows."""
+        if self.compressed:
+            self.book_file.write((json.dumps(book) + "\n").encode("UTF-8"))
+        elif self.regular_json:
+            self.book_file.write((", " if self.num_books > 0 else "") + json.dumps(book))
+        else:
+            self.book_file.write(json.dumps(book) + "\n")
+
+        self.lookup_file.write(lookup_row(book))
+        self.pay_split_file.write(pay_split_row(book))
+        if self.write_event_list:
+            add_unique_events(self.event_items, book)
+        self.num_books += 1
+
+    def close(self) -> None:
+        """Finalize the compressed frame and close all output files."""
+        if self.regular_json:
+            self.book_file.write("]")
+        self.book_file.close()
+        self.lookup_file.close()
+        self.pay_split_file.close()
@@ -6,11 +6,7 @@ import shutil
 import warnings
 from collections import defaultdict
 from utils.get_file_hash import get_hash
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_lookup_length,
-    get_distribution_moments,
-)
+from utils.analysis.distribution_functions import WinDistribution
 
 
 def copy_and_rename_csv(filepath: str) -> None:
@@ -328,10 +324,10 @@ def make_be_config(gamestate):
             copy_and_rename_csv(base_table)
 
         lut_sha_value = get_hash(lut_table)
-        dist = make_win_distribution(lut_table)
-        _, std_val, _, _ = get_distribution_moments(dist)
+        dist = WinDistribution.from_lookup(lut_table)
+        _, std_val, _, _ = dist.moments()
         std_val = round(std_val / bet.get_cost(), 2)
-        booklength = get_lookup_length(lut_table)
+        booklength = dist.num_events
 
         _, lut_nme = os.path.split(lut_table)
         dic = {
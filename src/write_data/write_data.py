@@ -7,8 +7,11 @@ import os
 import hashlib
 import json
 import ast
+from io import BufferedReader
 import zstandard as zstd
 
+from src.write_data.binary_lookup import write_binary_lookup, load_binary_lookup
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -74,13 +77,32 @@ def get_force_options(force_results: dict):
     return {key: list(val) for key, val in force_keys.items()}
 
 
+def lookup_row(book: dict) -> str:
+    """Lookup table row for a single JSON-ready book: id,weight,payout."""
+    return "{},1,{}\n".format(book["id"], book["payoutMultiplier"])
+
+
+def pay_split_row(book: dict) -> str:
+    """Segmented lookup table row for a single JSON-ready book: id,criteria,basegame,freegame."""
+    return (
+        str(book["id"])
+        + ","
+        + str(book["criteria"])
+        + ","
+        + str(round(book["baseGameWins"], 2))
+        + ","
+        + str(round(book["freeGameWins"], 2))
+        + "\n"
+    )
+
+
 def make_lookup_tables(gamestate: object, name: str):
     """Write lookup tables for all simulations."""
     file = open(name, "w", encoding="UTF-8")
     sims = list(gamestate.library.keys())
     sims.sort()
     for sim in sims:
-        file.write("{},1,{}\n".format(gamestate.library[sim]["id"], gamestate.library[sim]["payoutMultiplier"]))
+        file.write(lookup_row(gamestate.library[sim]))
     file.close()
 
 
@@ -90,31 +112,28 @@ def make_lookup_pay_split(gamestate: object, name: str):
     sims = list(gamestate.library.keys())
     sims.sort()
     for sim in sims:
-        file.write(
-            str(gamestate.library[sim]["id"])
-            + ","
-            + str(gamestate.library[sim]["criteria"])
-            + ","
-            + str(round(gamestate.library[sim]["baseGameWins"], 2))
-            + ","
-            + str(round(gamestate.library[sim]["freeGameWins"], 2))
-            + "\n"
-        )
+        file.write(pay_split_row(gamestate.library[sim]))
     file.close()
 
 
+def add_unique_events(event_items: dict, book: dict) -> None:
+    """Update event_items with the first example of each event type found in a book."""
+    for instance in book["events"]:
+        lib_event = instance["type"]
+        if lib_event not in event_items:
+            event_items[lib_event] = {key: val for key, val in instance.items() if key != "index"}
+
+
 def write_library_events(gamestate: object, library: list, gametype: str):
     """Write all unique events within a given mode - with one example application."""
-    unique_event = []
     event_items = {}
     for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
+        add_unique_events(event_items, event)
+    write_event_items(gamestate, event_items, gametype)
+
+
+def write_event_items(gamestate: object, event_items: dict, gametype: str):
+    """Write unique event examples to the mode event config file."""
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -132,36 +151,51 @@ def output_lookup_and_force_files(
     gamestate: object,
     num_sims: int = 1000000,
     compress: bool = True,
+    shard_indices: list = None,
 ):
-    """Combine temporary lookup tables and force files into a single output."""
+    """Combine temporary lookup tables and force files into a single output.
+
+    shard_indices: ordered (thread_index, repeat_count, continues_previous) shards of the temporary files to combine,
+    continues_previous is True when a shard holds the next simulations of the previous shard's batch. If not passed,
+    the static batch split used by run_multi_process_sims is assumed.
+    """
     print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    if shard_indices is None:
+        num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+        shard_indices = [
+            (thread, repeat_index, False) for repeat_index in range(num_repeats) for thread in range(threads)
+        ]
     file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
-
-    if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+    for thread, repeat_index, _ in shard_indices:
+        file_list.append(gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress))
+
+    if compress and gamestate.config.book_index_block_size is not None:
+        dict_data = load_book_dictionary(gamestate, betmode)
+        write_indexed_books(
+            file_list,
+            gamestate.output_files.get_final_book_name(betmode, True),
+            gamestate.output_files.get_book_index_name(betmode),
+            gamestate.config.book_index_block_size,
+            compressor=get_book_compressor(gamestate.config, dict_data=dict_data),
+            dict_data=dict_data,
+        )
+    elif compress:
+        dict_data = load_book_dictionary(gamestate, betmode)
+        merge_compressed_books(
+            file_list,
+            gamestate.output_files.get_final_book_name(betmode, True),
+            concatenate_frames=gamestate.config.concatenate_book_shards,
+            compressor=get_book_compressor(gamestate.config, dict_data=dict_data),
+            dict_data=dict_data,
+        )
     else:
         with open(
             gamestate.output_files.get_final_book_name(betmode, False),
             "w",
             encoding="UTF-8",
         ) as outfile:
+            # chunks of one batch are joined as json.dumps would join them within a single batch file
+            separators = [", " if continues_previous else "," for _, _, continues_previous in shard_indices]
             for id, filename in enumerate(file_list):
                 with open(filename, "r", encoding="UTF-8") as infile:
                     file_data = infile.read()
@@ -173,18 +207,17 @@ def output_lookup_and_force_files(
                         elif id == 0 and len(file_list) > 1:
                             outfile.write(file_data[:-1])  # don't write final ']'
                         elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
+                            outfile.write(separators[id] + file_data[1:-1])  # don't write first or last '[/]'
                         else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+                            outfile.write(separators[id] + file_data[1::])  # dont write first '[', write last ']'
 
     print("Saving force files for", game_id, "in", betmode)
     force_results_dict = {}
     file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
+    for thread, repeat_index, _ in shard_indices:
+        file_list.append(
+            gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
+        )
 
     for filename in file_list:
         force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
@@ -227,14 +260,9 @@ def output_lookup_and_force_files(
     weights_plus_wins_file_list = []
     segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    for thread, repeat_index, _ in shard_indices:
+        weights_plus_wins_file_list += [gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)]
+        segmented_lut_file_list += [gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)]
 
     with open(
         gamestate.output_files.get_final_lookup_name(betmode),
@@ -251,6 +279,10 @@ def output_lookup_and_force_files(
             gamestate.output_files.get_final_lookup_name(betmode),
             gamestate.output_files.get_optimized_lookup_name(betmode),
         )
+    if gamestate.config.write_binary_lookups:
+        write_binary_lookup(gamestate.output_files.get_final_lookup_name(betmode))
+        if load_binary_lookup(gamestate.output_files.get_optimized_lookup_name(betmode)) is None:
+            write_binary_lookup(gamestate.output_files.get_optimized_lookup_name(betmode))
     with open(
         gamestate.output_files.get_final_segmented_name(betmode),
         "w",
@@ -261,13 +293,147 @@ def output_lookup_and_force_files(
                 outfile.write(infile.read())
 
 
+def get_zstd_params(level: int = 3, threads: int = 0, ldm_window_log: int = None) -> zstd.ZstdCompressionParameters:
+    """zstd compression parameters, long distance matching is enabled if a window size is given."""
+    if ldm_window_log is None:
+        return zstd.ZstdCompressionParameters.from_level(level, threads=threads)
+    return zstd.ZstdCompressionParameters.from_level(
+        level, threads=threads, enable_ldm=True, window_log=ldm_window_log
+    )
+
+
+def get_book_compressor(
+    config: object, threads: int = None, dict_data: zstd.ZstdCompressionDict = None
+) -> zstd.ZstdCompressor:
+    """
+    Construct a compressor from the game configuration book compression settings.
+    threads overrides config.book_compression_threads, worker processes writing temporary files use 0.
+    """
+    if threads is None:
+        threads = config.book_compression_threads
+    params = get_zstd_params(config.book_compression_level, threads, config.book_ldm_window_log)
+    return zstd.ZstdCompressor(compression_params=params, dict_data=dict_data)
+
+
+def train_book_dictionary(gamestate: object, betmode: str, books: list) -> zstd.ZstdCompressionDict:
+    """
+    Train a zstd dictionary from sample books and write it next to the published books file.
+    If there are too few samples to train from, any existing dictionary for the mode is removed.
+    """
+    dict_name = gamestate.output_files.get_book_dictionary_name(betmode)
+    samples = [(json.dumps(book) + "\n").encode("UTF-8") for book in books]
+    try:
+        dict_data = zstd.train_dictionary(gamestate.config.book_dictionary_size, samples)
+    except zstd.ZstdError:
+        warn(f"Could not train a book dictionary for {betmode} from {len(samples)} samples, compressing without.")
+        if os.path.exists(dict_name):
+            os.remove(dict_name)
+        return None
+    with open(dict_name, "wb") as f:
+        f.write(dict_data.as_bytes())
+    return dict_data
+
+
+def load_book_dictionary(gamestate: object, betmode: str) -> zstd.ZstdCompressionDict:
+    """Return the trained dictionary for a mode, or None if dictionaries are disabled or not trained."""
+    dict_name = gamestate.output_files.get_book_dictionary_name(betmode)
+    if not gamestate.config.train_book_dictionary or not os.path.exists(dict_name):
+        return None
+    with open(dict_name, "rb") as f:
+        return zstd.ZstdCompressionDict(f.read())
+
+
+def merge_compressed_books(
+    file_list: list,
+    final_out: str,
+    concatenate_frames: bool = False,
+    compressor: zstd.ZstdCompressor = None,
+    dict_data: zstd.ZstdCompressionDict = None,
+) -> None:
+    """
+    Combine compressed temporary book files without writing or holding the full uncompressed books.
+
+    concatenate_frames: copy each shard's zstd frame directly into the output. Decoders which read across
+    frames (e.g zstd CLI, stream_reader(read_across_frames=True)) see the same JSONL content.
+    Otherwise shards are streamed through the (multi-threaded) compressor into a single frame.
+    dict_data: dictionary the shards were compressed with, if any.
+    """
+    if compressor is None:
+        compressor = zstd.ZstdCompressor(threads=-1)
+    with open(final_out, "wb") as f_out:
+        if concatenate_frames:
+            for fname in file_list:
+                with open(fname, "rb") as infile:
+                    shutil.copyfileobj(infile, f_out, 1 << 20)
+        else:
+            decompressor = zstd.ZstdDecompressor(dict_data=dict_data, max_window_size=2**31)
+            with compressor.stream_writer(f_out, closefd=False) as writer:
+                for fname in file_list:
+                    with open(fname, "rb") as infile:
+                        # Shards written by a stream do not record their content size, so decompress as a stream
+                        decompressor.copy_stream(infile, writer)
+
+
+def book_line_id(line: bytes) -> int:
+    """Book id from a serialized book, books are written by Book.to_json() with "id" as the first key."""
+    return int(line[line.index(b":") + 1 : line.index(b",")])
+
+
+def write_indexed_books(
+    file_list: list,
+    final_out: str,
+    index_out: str,
+    block_size: int,
+    compressor: zstd.ZstdCompressor,
+    dict_data: zstd.ZstdCompressionDict = None,
+) -> None:
+    """
+    Write books as independently compressed blocks of block_size books, with a JSON sidecar index.
+    The books file remains a valid multi-frame .jsonl.zst. Each index entry is
+    [first_id, last_id, num_books, byte_offset, byte_length], so a single book is read with one seek
+    and decompressing one block.
+    """
+    assert block_size > 0, "book_index_block_size must be a positive integer"
+    decompressor = zstd.ZstdDecompressor(dict_data=dict_data, max_window_size=2**31)
+    blocks = []
+    block_lines = []
+    offset = 0
+
+    def write_block(f_out):
+        nonlocal offset
+        frame = compressor.compress(b"".join(block_lines))
+        f_out.write(frame)
+        blocks.append(
+            [book_line_id(block_lines[0]), book_line_id(block_lines[-1]), len(block_lines), offset, len(frame)]
+        )
+        offset += len(frame)
+        block_lines.clear()
+
+    with open(final_out, "wb") as f_out:
+        for fname in file_list:
+            with open(fname, "rb") as infile, decompressor.stream_reader(infile, read_across_frames=True) as reader:
+                for line in BufferedReader(reader):
+                    if not line.strip():
+                        continue
+                    block_lines.append(line)
+                    if len(block_lines) == block_size:
+                        write_block(f_out)
+        if len(block_lines) > 0:
+            write_block(f_out)
+
+    with open(index_out, "w", encoding="UTF-8") as f:
+        json.dump({"block_size": block_size, "blocks": blocks}, f)
+
+
 def write_json(gamestate, filename: str):
     """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
     json_objects = [json.dumps(item) for item in gamestate.library.values()]
     combined_data = "\n".join(json_objects) + "\n"
 
     if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
+        compressor = get_book_compressor(
+            gamestate.config, threads=0, dict_data=load_book_dictionary(gamestate, gamestate.betmode)
+        )
         compressed_data = compressor.compress(combined_data.encode("UTF-8"))
         with open(filename, "wb") as f:
             f.write(compressed_data)
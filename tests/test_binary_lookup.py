@@ -0,0 +1,81 @@
+"""Binary lookup tables against their CSV source."""
+
+import os
+import warnings
+import numpy as np
+import pytest
+
+from src.write_data.binary_lookup import write_binary_lookup, load_binary_lookup
+from utils.rgs_verification import verify_lookup_format
+
+LOOKUP_ROWS = [(1, 10, 0), (2, 5, 120), (3, 1, 4550), (4, 30, 0), (5, 2, 10)]
+
+
+def write_lookup_csv(name, rows) -> str:
+    """Write an id,weight,payout lookup table."""
+    with open(name, "w", encoding="UTF-8") as f:
+        for row in rows:
+            f.write("{},{},{}\n".format(*row))
+    return str(name)
+
+
+def get_binary_name(csv_name: str) -> str:
+    """Binary table written for csv_name."""
+    return os.path.splitext(csv_name)[0] + ".npy"
+
+
+def test_binary_lookup_round_trip(tmp_path):
+    csv_name = write_lookup_csv(tmp_path / "lookUpTable_base.csv", LOOKUP_ROWS)
+    csv_result = verify_lookup_format(csv_name)
+    write_binary_lookup(csv_name)
+    lookup = load_binary_lookup(csv_name)
+    assert lookup is not None
+    assert np.array_equal(np.array(lookup.tolist()), np.array(LOOKUP_ROWS))
+    binary_result = verify_lookup_format(csv_name)
+    assert binary_result[1:] == csv_result[1:]
+    assert binary_result[0].to_dict() == csv_result[0].to_dict()
+
+
+def test_binary_lookup_falls_back_to_changed_csv(tmp_path):
+    csv_name = write_lookup_csv(tmp_path / "lookUpTable_base.csv", LOOKUP_ROWS)
+    write_binary_lookup(csv_name)
+    modified_time = os.path.getmtime(get_binary_name(csv_name)) + 10
+    # Same size, different contents, and a CSV that looks older than the binary table
+    write_lookup_csv(csv_name, [(1, 10, 0), (2, 5, 120), (3, 1, 4550), (4, 30, 0), (5, 3, 10)])
+    os.utime(csv_name, (modified_time - 100, modified_time - 100))
+    assert load_binary_lookup(csv_name) is None
+
+    os.remove(os.path.splitext(csv_name)[0] + ".npy.json")
+    write_lookup_csv(csv_name, LOOKUP_ROWS)
+    assert load_binary_lookup(csv_name) is None
+
+
+def test_binary_lookup_verifies_touched_csv(tmp_path):
+    csv_name = write_lookup_csv(tmp_path / "lookUpTable_base.csv", LOOKUP_ROWS)
+    write_binary_lookup(csv_name)
+    modified_time = os.path.getmtime(csv_name) + 10
+    os.utime(csv_name, (modified_time, modified_time))
+    assert load_binary_lookup(csv_name) is None
+    assert load_binary_lookup(csv_name, verify=True) is not None
+    assert load_binary_lookup(csv_name) is not None
+
+    write_lookup_csv(csv_name, [(1, 10, 0), (2, 5, 120), (3, 1, 4550), (4, 30, 0), (5, 3, 10)])
+    assert load_binary_lookup(csv_name, verify=True) is None
+
+
+def test_binary_lookup_format_checks(tmp_path):
+    csv_name = write_lookup_csv(tmp_path / "lookUpTable_base.csv", [(1, 1, 0), (2, 1, 5)])
+    write_binary_lookup(csv_name)
+    assert load_binary_lookup(csv_name) is not None
+    with pytest.raises(AssertionError, match="Minimum non-zero payout"):
+        verify_lookup_format(csv_name)
+
+
+def test_empty_binary_lookup(tmp_path):
+    csv_name = write_lookup_csv(tmp_path / "lookUpTable_base.csv", [])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        write_binary_lookup(csv_name)
+    assert len(load_binary_lookup(csv_name)) == 0
+    _, payouts, total_weight, min_win, max_win = verify_lookup_format(csv_name)
+    assert payouts == [] and total_weight == 0 and min_win is None and max_win is None
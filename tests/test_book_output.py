@@ -0,0 +1,158 @@
+"""Round trips for compressed book shards and published books files."""
+
+import json
+from types import SimpleNamespace
+import zstandard as zstd
+import pytest
+
+from src.write_data.write_data import (
+    merge_compressed_books,
+    get_book_compressor,
+    train_book_dictionary,
+    load_book_dictionary,
+    write_indexed_books,
+)
+from utils.decompress_zstd import get_books_decompressor
+from utils.indexed_books import IndexedBooks
+
+
+def make_book_lines(first_id: int, num_books: int) -> bytes:
+    """Serialized books in the Book.to_json() layout, one per line."""
+    lines = []
+    for book_id in range(first_id, first_id + num_books):
+        book = {
+            "id": book_id,
+            "payoutMultiplier": book_id * 10 % 70,
+            "events": [{"index": 0, "type": "reveal", "board": [[{"name": "H1"}, {"name": "L2"}]] * 5}],
+            "criteria": "basegame",
+            "baseGameWins": 0.0,
+            "freeGameWins": 0.0,
+        }
+        lines.append(json.dumps(book) + "\n")
+    return "".join(lines).encode("UTF-8")
+
+
+def write_shards(tmp_path, shard_contents: list, compressor: zstd.ZstdCompressor) -> list:
+    """Compress each shard as the worker processes do, the first one as a stream without a content size."""
+    file_list = []
+    for index, contents in enumerate(shard_contents):
+        name = str(tmp_path / f"books_base_0_{index}.jsonl.zst")
+        with open(name, "wb") as f:
+            if index == 0:
+                with compressor.stream_writer(f, closefd=False) as writer:
+                    writer.write(contents)
+            else:
+                f.write(compressor.compress(contents))
+        file_list.append(name)
+    return file_list
+
+
+def read_books(name: str, dict_data: zstd.ZstdCompressionDict = None) -> bytes:
+    """Decompress a books file across all of its frames."""
+    with open(name, "rb") as f:
+        decompressor = zstd.ZstdDecompressor(dict_data=dict_data, max_window_size=2**31)
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
+            return reader.read()
+
+
+@pytest.mark.parametrize("concatenate_frames", [False, True])
+def test_merge_compressed_books(tmp_path, concatenate_frames):
+    shard_contents = [make_book_lines(1, 40), make_book_lines(41, 25), make_book_lines(66, 1)]
+    file_list = write_shards(tmp_path, shard_contents, zstd.ZstdCompressor())
+    final_out = str(tmp_path / "books_base.jsonl.zst")
+    merge_compressed_books(file_list, final_out, concatenate_frames=concatenate_frames)
+    assert read_books(final_out) == b"".join(shard_contents)
+
+
+@pytest.mark.parametrize(
+    "level, threads, ldm_window_log",
+    [(3, 0, None), (19, 0, None), (3, 2, None), (9, -1, 27)],
+)
+def test_book_compressor_settings(tmp_path, level, threads, ldm_window_log):
+    config = SimpleNamespace(
+        book_compression_level=level, book_compression_threads=threads, book_ldm_window_log=ldm_window_log
+    )
+    shard_contents = [make_book_lines(1, 30), make_book_lines(31, 30)]
+    file_list = write_shards(tmp_path, shard_contents, get_book_compressor(config, threads=0))
+    final_out = str(tmp_path / "books_base.jsonl.zst")
+    merge_compressed_books(file_list, final_out, compressor=get_book_compressor(config))
+    assert read_books(final_out) == b"".join(shard_contents)
+
+
+def make_dictionary_gamestate(tmp_path) -> SimpleNamespace:
+    """Minimal gamestate with the settings and output names used by book dictionaries."""
+    config = SimpleNamespace(
+        book_compression_level=3,
+        book_compression_threads=0,
+        book_ldm_window_log=None,
+        train_book_dictionary=True,
+        book_dictionary_size=4096,
+    )
+    output_files = SimpleNamespace(get_book_dictionary_name=lambda betmode: str(tmp_path / f"books_{betmode}.zdict"))
+    return SimpleNamespace(config=config, output_files=output_files)
+
+
+def test_dictionary_compressed_books(tmp_path):
+    gamestate = make_dictionary_gamestate(tmp_path)
+    sample_books = [json.loads(line) for line in make_book_lines(1000, 500).splitlines()]
+    assert train_book_dictionary(gamestate, "base", sample_books) is not None
+    dict_data = load_book_dictionary(gamestate, "base")
+
+    shard_contents = [make_book_lines(1, 30), make_book_lines(31, 30)]
+    file_list = write_shards(tmp_path, shard_contents, get_book_compressor(gamestate.config, dict_data=dict_data))
+    final_out = str(tmp_path / "books_base.jsonl.zst")
+    merge_compressed_books(
+        file_list, final_out, compressor=get_book_compressor(gamestate.config, dict_data=dict_data), dict_data=dict_data
+    )
+    with pytest.raises(zstd.ZstdError):
+        read_books(final_out)
+    with open(final_out, "rb") as f, get_books_decompressor(final_out).stream_reader(
+        f, read_across_frames=True
+    ) as reader:
+        assert reader.read() == b"".join(shard_contents)
+
+
+def test_dictionary_not_trained_from_few_samples(tmp_path):
+    gamestate = make_dictionary_gamestate(tmp_path)
+    sample_books = [json.loads(line) for line in make_book_lines(1000, 500).splitlines()]
+    train_book_dictionary(gamestate, "base", sample_books)
+    with pytest.warns(UserWarning):
+        assert train_book_dictionary(gamestate, "base", sample_books[:1]) is None
+    assert load_book_dictionary(gamestate, "base") is None
+
+
+@pytest.fixture
+def indexed_books(tmp_path):
+    """Books 1-40 and 46-60 published in blocks of 7, with the index next to them."""
+    shard_contents = [make_book_lines(1, 40), make_book_lines(46, 15)]
+    file_list = write_shards(tmp_path, shard_contents, zstd.ZstdCompressor())
+    final_out = str(tmp_path / "books_base.jsonl.zst")
+    write_indexed_books(file_list, final_out, str(tmp_path / "books_base.index.json"), 7, zstd.ZstdCompressor())
+    with IndexedBooks(final_out, cache_blocks=2) as books:
+        yield books, b"".join(shard_contents)
+
+
+def test_indexed_books_file_is_valid_jsonl(tmp_path, indexed_books):
+    _, contents = indexed_books
+    assert read_books(str(tmp_path / "books_base.jsonl.zst")) == contents
+
+
+def test_indexed_get_book(indexed_books):
+    books, _ = indexed_books
+    for book_id in [1, 7, 8, 40, 46, 52, 60]:
+        assert books.get_book(book_id)["id"] == book_id
+    assert [book["id"] for book in books.get_books([52, 3, 46])] == [52, 3, 46]
+
+
+def test_indexed_get_book_range(indexed_books):
+    books, _ = indexed_books
+    assert [book["id"] for book in books.get_book_range(5, 20)] == list(range(5, 21))
+    assert [book["id"] for book in books.get_book_range(38, 50)] == [38, 39, 40, 46, 47, 48, 49, 50]
+    assert books.get_book_range(61, 70) == []
+
+
+@pytest.mark.parametrize("book_id", [0, 41, 45, 61])
+def test_indexed_missing_book(indexed_books, book_id):
+    books, _ = indexed_books
+    with pytest.raises(KeyError):
+        books.get_book(book_id)
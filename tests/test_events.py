@@ -0,0 +1,165 @@
+"""Check that lazily built events serialize exactly like events built when emitted."""
+
+import json
+from types import SimpleNamespace
+import pytest
+
+from src.calculations.symbol import Symbol
+from src.events.event_constants import EventConstants
+from src.events.events import (
+    json_ready_sym,
+    copy_payload,
+    fs_trigger_event,
+    reveal_event,
+    tumble_board_event,
+    win_info_event,
+)
+from src.state.books import Book
+
+
+class EventConfig:
+    """Minimal configuration for emitting board and win events."""
+
+    def __init__(self, include_padding: bool):
+        self.paytable = {(3, "H1"): 5, (3, "L1"): 1, (3, "W"): 10}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["M"]}
+        self.include_padding = include_padding
+        self.num_reels = 3
+        self.wincap = 50
+
+
+def make_gamestate(include_padding: bool) -> SimpleNamespace:
+    """Gamestate holding a board with special symbols, tumble replacements and win data."""
+    config = EventConfig(include_padding)
+
+    def symbol(name, **attributes):
+        sym = Symbol(config, name)
+        sym.assign_attribute(attributes)
+        return sym
+
+    return SimpleNamespace(
+        config=config,
+        book=Book(1, "basegame"),
+        gametype="basegame",
+        board=[
+            [symbol("H1"), symbol("W", multiplier=3), symbol("L1")],
+            [symbol("S"), symbol("H1"), symbol("M", multiplier=5)],
+            [symbol("L1"), symbol("L1"), symbol("H1")],
+        ],
+        top_symbols=[symbol("L1"), symbol("M", multiplier=2), symbol("H1")],
+        bottom_symbols=[symbol("S"), symbol("H1"), symbol("W")],
+        reel_positions=[4, 17, 9],
+        anticipation=[0, 0, 1],
+        new_symbols_from_tumble=[[symbol("H1")], [], [symbol("M", multiplier=10), symbol("L1")]],
+        win_data={
+            "totalWin": 75.5,
+            "wins": [
+                {
+                    "symbol": "H1",
+                    "kind": 3,
+                    "win": 60.0,
+                    "positions": [{"reel": 0, "row": 0}, {"reel": 1, "row": 1}, {"reel": 2, "row": 2}],
+                    "meta": {"winWithoutMult": 20.0, "globalMult": 1, "overlay": {"reel": 1, "row": 1}},
+                },
+                {
+                    "symbol": "L1",
+                    "kind": 3,
+                    "win": 15.5,
+                    "positions": [{"reel": 0, "row": 2}, {"reel": 2, "row": 0}, {"reel": 2, "row": 1}],
+                },
+            ],
+        },
+    )
+
+
+def eager_reveal_event(gamestate):
+    """Original reveal_event, building the JSON board when emitted."""
+    special_attributes = list(gamestate.config.special_symbols.keys())
+    board_client = [[json_ready_sym(symbol, special_attributes) for symbol in reel] for reel in gamestate.board]
+    if gamestate.config.include_padding:
+        for reel, _ in enumerate(board_client):
+            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[reel]
+            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+    gamestate.book.add_event(
+        {
+            "index": len(gamestate.book.events),
+            "type": EventConstants.REVEAL.value,
+            "board": board_client,
+            "paddingPositions": list(gamestate.reel_positions),
+            "gameType": gamestate.gametype,
+            "anticipation": list(gamestate.anticipation),
+        }
+    )
+
+
+def eager_win_info_event(gamestate, include_padding_index=True):
+    """Original win_info_event, copying and converting the wins when emitted."""
+    wins = copy_payload(gamestate.win_data["wins"])
+    for win in wins:
+        if include_padding_index:
+            win["positions"] = [{"reel": p["reel"], "row": p["row"] + 1} for p in win["positions"]]
+        win["win"] = int(round(min(win["win"], gamestate.config.wincap) * 100, 0))
+        if "meta" in win:
+            win["meta"]["winWithoutMult"] = int(min(win["meta"]["winWithoutMult"] * 100, gamestate.config.wincap * 100))
+            if "overlay" in win["meta"] and include_padding_index:
+                win["meta"]["overlay"]["row"] += 1
+    gamestate.book.add_event(
+        {
+            "index": len(gamestate.book.events),
+            "type": EventConstants.WIN_DATA.value,
+            "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
+            "wins": wins,
+        }
+    )
+
+
+def eager_tumble_board_event(gamestate):
+    """Original tumble_board_event, building the JSON symbols when emitted."""
+    special_attributes = list(gamestate.config.special_symbols.keys())
+    row_offset = 1 if gamestate.config.include_padding else 0
+    exploding = [
+        {"reel": pos["reel"], "row": pos["row"] + row_offset}
+        for win in gamestate.win_data["wins"]
+        for pos in win["positions"]
+    ]
+    new_symbols = [[json_ready_sym(s, special_attributes) for s in reel] for reel in gamestate.new_symbols_from_tumble]
+    gamestate.book.add_event(
+        {
+            "index": len(gamestate.book.events),
+            "type": EventConstants.TUMBLE_BOARD.value,
+            "newSymbols": new_symbols,
+            "explodingSymbols": sorted(exploding, key=lambda x: x["reel"]),
+        }
+    )
+
+
+def emit_events(gamestate, reveal, win_info, tumble_board) -> None:
+    """Emit a reveal, win info (with and without padding rows) and tumble event, then change the win data."""
+    reveal(gamestate)
+    win_info(gamestate)
+    win_info(gamestate, include_padding_index=False)
+    tumble_board(gamestate)
+    gamestate.win_data["wins"][0]["win"] = 0.0
+    gamestate.win_data["wins"].pop()
+    gamestate.win_data["totalWin"] = 0.0
+
+
+@pytest.mark.parametrize("include_padding", [True, False])
+def test_lazy_events_match_eager_events(include_padding):
+    lazy_gamestate = make_gamestate(include_padding)
+    emit_events(lazy_gamestate, reveal_event, win_info_event, tumble_board_event)
+    eager_gamestate = make_gamestate(include_padding)
+    emit_events(eager_gamestate, eager_reveal_event, eager_win_info_event, eager_tumble_board_event)
+
+    assert json.dumps(lazy_gamestate.book.to_json()) == json.dumps(eager_gamestate.book.to_json())
+    assert lazy_gamestate.win_data == eager_gamestate.win_data
+
+
+def test_fs_trigger_leaves_scatter_positions_unchanged():
+    gamestate = make_gamestate(True)
+    gamestate.tot_fs = 10
+    gamestate.special_syms_on_board = {"scatter": [{"reel": 0, "row": 2}, {"reel": 1, "row": 0}]}
+    fs_trigger_event(gamestate, basegame_trigger=True, freegame_trigger=False)
+
+    assert gamestate.special_syms_on_board["scatter"] == [{"reel": 0, "row": 2}, {"reel": 1, "row": 0}]
+    assert gamestate.book.get_event(0)["positions"] == [{"reel": 0, "row": 3}, {"reel": 1, "row": 1}]
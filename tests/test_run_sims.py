@@ -0,0 +1,137 @@
+"""Check that the worker pool writes the same books and lookup tables as forked batches."""
+
+import os
+import sys
+import warnings
+import pytest
+
+from src.config import output_filenames
+from src.state.books import set_event_alias_check
+from src.state.run_sims import create_books, SimulationPool
+from utils.decompress_zstd import get_books_decompressor
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "games", "0_0_cluster")
+
+
+@pytest.fixture(scope="module")
+def cluster_game():
+    """GameState and GameConfig classes of the 0_0_cluster sample game."""
+    sys.path.insert(0, GAME_PATH)
+    from gamestate import GameState  # pylint: disable=import-outside-toplevel
+    from game_config import GameConfig  # pylint: disable=import-outside-toplevel
+
+    yield GameState, GameConfig
+    sys.path.remove(GAME_PATH)
+
+
+def run_cluster_books(
+    cluster_game, library_root, threads=2, batch_size=50, num_sims=200, config_settings=None, **kwargs
+) -> dict:
+    """
+    Create books for both modes under library_root, returning the contents of the published files.
+    config_settings: config attributes to set before the gamestate is created.
+    """
+    game_state, game_config = cluster_game
+    original_path = output_filenames.PATH_TO_GAMES
+    output_filenames.PATH_TO_GAMES = str(library_root)
+    try:
+        config = game_config()
+        for key, value in (config_settings or {}).items():
+            setattr(config, key, value)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            gamestate = game_state(config)
+            modes = {betmode.get_name(): num_sims for betmode in config.bet_modes}
+            create_books(gamestate, config, modes, batch_size, threads, True, False, **kwargs)
+    finally:
+        output_filenames.PATH_TO_GAMES = original_path
+
+    outputs = {}
+    for mode in modes:
+        books_name = gamestate.output_files.get_final_book_name(mode, True)
+        with open(books_name, "rb") as f, get_books_decompressor(books_name).stream_reader(
+            f, read_across_frames=True
+        ) as reader:
+            outputs[f"books_{mode}"] = reader.read()
+        for name in [
+            gamestate.output_files.get_final_lookup_name(mode),
+            gamestate.output_files.get_final_segmented_name(mode),
+        ]:
+            with open(name, "rb") as f:
+                outputs[os.path.basename(name)] = f.read()
+    return outputs
+
+
+@pytest.fixture(scope="module")
+def forked_outputs(cluster_game, tmp_path_factory):
+    """Outputs of the default (new processes per batch) run."""
+    return run_cluster_books(cluster_game, tmp_path_factory.mktemp("forked"))
+
+
+def test_worker_pool_matches_forked_batches(cluster_game, forked_outputs, tmp_path):
+    pooled_outputs = run_cluster_books(cluster_game, tmp_path, use_worker_pool=True)
+    assert pooled_outputs.keys() == forked_outputs.keys()
+    for name, contents in forked_outputs.items():
+        assert pooled_outputs[name] == contents, name
+
+
+@pytest.mark.parametrize("sim_chunk_size", [10, 37, 64])
+def test_sim_chunks_match_forked_batches(cluster_game, forked_outputs, tmp_path, sim_chunk_size):
+    chunked_outputs = run_cluster_books(cluster_game, tmp_path, use_worker_pool=True, sim_chunk_size=sim_chunk_size)
+    for name, contents in forked_outputs.items():
+        assert chunked_outputs[name] == contents, name
+
+
+def test_streamed_books_match_buffered(cluster_game, forked_outputs, tmp_path):
+    streamed_outputs = run_cluster_books(cluster_game, tmp_path, config_settings={"stream_books": True})
+    for name, contents in forked_outputs.items():
+        assert streamed_outputs[name] == contents, name
+
+
+class ExitingGameState:
+    """Stands in for a gamestate whose worker process dies without returning a result."""
+
+    def run_sim_range(self, *args, **kwargs):
+        os._exit(1)
+
+
+def test_pool_raises_when_worker_exits(monkeypatch):
+    monkeypatch.setattr(SimulationPool, "poll_interval", 0.1)
+    pool = SimulationPool(ExitingGameState(), 1)
+    task = {
+        "betmode": "base",
+        "sim_to_criteria": {0: "0"},
+        "sim_start": 0,
+        "sim_end": 1,
+        "thread_index": 0,
+        "repeat_count": 0,
+        "compress": True,
+        "write_event_list": False,
+        "print_rtp": False,
+    }
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        pool.run_tasks([task])
+
+
+def sample_bonus_books(cluster_game, num_sims=20) -> list:
+    """Books of the first bonus-mode sims, with check_event_aliasing on."""
+    game_state, game_config = cluster_game
+    config = game_config()
+    config.check_event_aliasing = True
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        gamestate = game_state(config)
+    try:
+        return gamestate.sample_books("bonus", {sim: "freegame" for sim in range(num_sims)}, range(num_sims))
+    finally:
+        set_event_alias_check(False)
+
+
+def test_event_alias_check(cluster_game, monkeypatch):
+    assert len(sample_bonus_books(cluster_game)) == 20
+
+    import game_events  # pylint: disable=import-outside-toplevel
+
+    monkeypatch.setattr(game_events, "copy_payload", lambda value: value)
+    with pytest.raises(RuntimeError, match="was modified after it was added"):
+        sample_bonus_books(cluster_game)
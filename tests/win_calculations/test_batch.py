@@ -0,0 +1,106 @@
+"""Test batch win evaluation against the single-board evaluators."""
+
+import random
+import numpy as np
+import pytest
+from src.calculations.batch import BatchWins
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from src.calculations.scatter import Scatter
+from src.calculations.cluster import Cluster
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+from tests.win_calculations.test_wayspay import create_test_ways_gamestate
+from tests.win_calculations.test_scatterpay import create_test_scatter_gamestate
+from tests.win_calculations.test_clusterpay import create_test_cluster_gamestate
+
+
+def random_boards(gamestate, symbols, num_boards, seed):
+    """Random symbol boards with matching id and multiplier arrays."""
+    rng = random.Random(seed)
+    config = gamestate.config
+    boards = []
+    board_ids = np.full((num_boards, config.num_reels, max(config.num_rows)), -1)
+    board_multipliers = np.ones(board_ids.shape)
+    for idx in range(num_boards):
+        board = [[gamestate.create_symbol(rng.choice(symbols)) for _ in range(rows)] for rows in config.num_rows]
+        for reel, _ in enumerate(board):
+            for row, sym in enumerate(board[reel]):
+                board_ids[idx, reel, row] = gamestate.symbol_storage.get_symbol_id(sym.name)
+                if sym.check_attribute("multiplier"):
+                    board_multipliers[idx, reel, row] = sym.get_attribute("multiplier")
+        boards.append(board)
+    return boards, board_ids, board_multipliers
+
+
+def test_batch_lines():
+    gamestate = create_test_lines_gamestate()
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["W", "WM", "H1", "X"], 200, 0)
+    batch = BatchWins.get_lines(gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers)
+    for idx, board in enumerate(boards):
+        assert batch["totalWin"][idx] == pytest.approx(Lines.get_lines(board, gamestate.config)["totalWin"])
+
+
+def test_batch_lines_beyond_reel_height():
+    """Cells below a reel's height end a line, like a non-paying scatter. X (the last symbol id) pays here."""
+    gamestate = create_test_lines_gamestate()
+    gamestate.config.paytable.update({(3, "X"): 5, (4, "X"): 15, (5, "X"): 25})
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["W", "WM", "H1", "X"], 500, 4)
+    for reel, height in [(1, 4), (3, 3)]:
+        board_ids[:, reel, height:] = -1
+        for board in boards:
+            for row in range(height, len(board[reel])):
+                board[reel][row] = gamestate.create_symbol("S")
+    batch = BatchWins.get_lines(gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers)
+    for idx, board in enumerate(boards):
+        assert batch["totalWin"][idx] == pytest.approx(Lines.get_lines(board, gamestate.config)["totalWin"])
+
+
+def test_batch_ways():
+    gamestate = create_test_ways_gamestate()
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["W", "H1", "H2", "X"], 200, 1)
+    batch = BatchWins.get_ways(gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers)
+    for idx, board in enumerate(boards):
+        assert batch["totalWin"][idx] == pytest.approx(Ways.get_ways_data(gamestate.config, board)["totalWin"])
+
+
+def test_batch_scatterpays():
+    gamestate = create_test_scatter_gamestate()
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["W", "WM", "H1", "H2"], 200, 2)
+    batch = BatchWins.get_scatterpays(
+        gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers
+    )
+    for idx, board in enumerate(boards):
+        expected = Scatter.get_scatterpay_wins(gamestate.config, board)["totalWin"]
+        assert batch["totalWin"][idx] == pytest.approx(expected)
+
+
+def test_batch_clusters():
+    gamestate = create_test_cluster_gamestate()
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["WM", "H1", "H2", "X"], 200, 3)
+    batch = BatchWins.get_clusters(
+        gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers
+    )
+    for idx, board in enumerate(boards):
+        clusters = Cluster.get_clusters(board)
+        _, _, total_win = Cluster.evaluate_clusters(
+            gamestate.config, board, clusters, return_data={"totalWin": 0, "wins": []}
+        )
+        assert batch["totalWin"][idx] == pytest.approx(total_win)
+
+
+def test_batch_clusters_beyond_reel_height():
+    gamestate = create_test_cluster_gamestate()
+    boards, board_ids, board_multipliers = random_boards(gamestate, ["WM", "H1", "H2"], 200, 5)
+    for reel, height in [(0, 4), (2, 3), (5, 5)]:
+        board_ids[:, reel, height:] = -1
+        for board in boards:
+            del board[reel][height:]
+    batch = BatchWins.get_clusters(
+        gamestate.config, gamestate.symbol_storage.symbol_names, board_ids, board_multipliers
+    )
+    for idx, board in enumerate(boards):
+        clusters = Cluster.get_clusters(board)
+        _, _, total_win = Cluster.evaluate_clusters(
+            gamestate.config, board, clusters, return_data={"totalWin": 0, "wins": []}
+        )
+        assert batch["totalWin"][idx] == pytest.approx(total_win)
@@ -0,0 +1,284 @@
+"""Test board generation from reelstrips and integer-encoded boards."""
+
+import random
+import numpy as np
+import pytest
+from src.calculations.board import Board
+from src.calculations.reelstrip import compile_reelstrips
+from src.calculations.statistics import get_random_outcome
+
+
+def make_reelstrip(rng: random.Random, num_reels: int) -> list:
+    """Random reelstrip of uneven reel lengths, with scatters, wilds and multiplier symbols."""
+    symbols = ["H1", "H2", "L1", "L2", "W", "S", "M"]
+    weights = [4, 4, 6, 6, 1, 1, 1]
+    return [rng.choices(symbols, weights, k=rng.randint(20, 40)) for _ in range(num_reels)]
+
+
+class GameBoardConfig:
+    """Testing game functions"""
+
+    def __init__(self):
+        self.game_id = "0_test_class"
+        self.num_reels = 5
+        self.num_rows = [3, 4, 5, 4, 3]
+        self.paytable = {(3, "H1"): 5, (3, "H2"): 3, (3, "L1"): 1, (3, "L2"): 1, (3, "W"): 10}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["M"]}
+        self.include_padding = True
+        self.encode_board = False
+        self.force_board_sampler = "rejection"
+        self.basegame_type = "basegame"
+        self.freegame_type = "freegame"
+        self.anticipation_triggers = {self.basegame_type: 2, self.freegame_type: 2}
+        rng = random.Random(0)
+        self.reels = {"BR0": make_reelstrip(rng, self.num_reels), "BR1": make_reelstrip(rng, self.num_reels)}
+
+
+class BoardTest(Board):
+    """Board with the game setup needed to draw from reelstrips."""
+
+    def __init__(self, config):
+        self.config = config
+        self.gametype = config.basegame_type
+        self.special_symbol_functions = {"M": [self.assign_mult_property]}
+        self.create_symbol_map()
+        self.compiled_reels = compile_reelstrips(config)
+        self.encoded_reels = {}
+
+    def assign_mult_property(self, symbol) -> None:
+        symbol.assign_attribute({"multiplier": get_random_outcome({2: 3, 5: 1, 10: 1})})
+
+    def get_current_distribution_conditions(self) -> dict:
+        return {"reel_weights": {self.config.basegame_type: {"BR0": 2, "BR1": 1}}}
+
+    def assign_special_sym_function(self):
+        pass
+
+    def run_spin(self, sim):
+        pass
+
+    def run_freespin(self):
+        pass
+
+
+def board_names(board: list) -> list:
+    """Symbol names of a board."""
+    return [[sym.name for sym in reel] for reel in board]
+
+
+@pytest.fixture
+def gamestate():
+    return BoardTest(GameBoardConfig())
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_encode_decode_board(gamestate, seed):
+    random.seed(seed)
+    gamestate.create_board_reelstrips()
+    gamestate.encode_board()
+    random.seed(seed)
+    gamestate.create_board_reelstrips()
+    decoded = gamestate.decode_board(gamestate.board_ids)
+
+    assert board_names(decoded) == board_names(gamestate.board)
+    for reel, rows in enumerate(gamestate.config.num_rows):
+        assert (gamestate.board_ids[reel, rows:] == -1).all()
+        for row in range(rows):
+            symbol = gamestate.board[reel][row]
+            expected = symbol.get_attribute("multiplier") if symbol.check_attribute("multiplier") else 1
+            assert gamestate.board_multipliers[reel, row] == expected
+            assert gamestate.symbol_storage.symbol_names[gamestate.board_ids[reel, row]] == symbol.name
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_draw_board_ids_matches_symbol_board(gamestate, seed):
+    random.seed(seed)
+    gamestate.create_board_reelstrips()
+    board_ids = gamestate.draw_board_ids(gamestate.reelstrip_id, gamestate.reel_positions)
+    gamestate.encode_board()
+    assert np.array_equal(board_ids, gamestate.board_ids)
+
+    random.seed(seed)
+    gamestate.config.encode_board = True
+    gamestate.create_board_reelstrips()
+    assert np.array_equal(gamestate.board_ids, board_ids)
+
+
+def draw_board_by_position(gamestate) -> dict:
+    """Original create_board_reelstrips, reading every position from the raw reelstrip."""
+    config = gamestate.config
+    special_syms_on_board = {special_type: [] for special_type in config.special_symbols}
+    reel_weights = gamestate.get_current_distribution_conditions()["reel_weights"][gamestate.gametype]
+    reelstrip_id = get_random_outcome(reel_weights)
+    reelstrip = config.reels[reelstrip_id]
+    reel_positions = [random.randrange(0, len(reelstrip[reel])) for reel in range(config.num_reels)]
+    board, top_symbols, bottom_symbols = [], [], []
+    first_scatter_reel = -1
+    for reel in range(config.num_reels):
+        reel_pos = reel_positions[reel]
+        strip = reelstrip[reel]
+        top_symbols.append(gamestate.create_symbol(strip[(reel_pos - 1) % len(strip)]))
+        bottom_symbols.append(gamestate.create_symbol(strip[(reel_pos + config.num_rows[reel]) % len(strip)]))
+        board.append([])
+        for row in range(config.num_rows[reel]):
+            sym = gamestate.create_symbol(strip[(reel_pos + row) % len(strip)])
+            board[reel].append(sym)
+            for special_type, names in config.special_symbols.items():
+                if sym.special and sym.name in names:
+                    special_syms_on_board[special_type].append({"reel": reel, "row": row})
+                    if (
+                        sym.check_attribute("scatter")
+                        and len(special_syms_on_board[special_type]) >= config.anticipation_triggers[gamestate.gametype]
+                        and first_scatter_reel == -1
+                    ):
+                        first_scatter_reel = reel + 1
+    anticipation = [0] * config.num_reels
+    if first_scatter_reel > -1 and first_scatter_reel != config.num_reels:
+        for count, reel in enumerate(range(first_scatter_reel, config.num_reels)):
+            anticipation[reel] = count + 1
+    return {
+        "reelstrip_id": reelstrip_id,
+        "reel_positions": reel_positions,
+        "board": board,
+        "top_symbols": top_symbols,
+        "bottom_symbols": bottom_symbols,
+        "special_syms_on_board": special_syms_on_board,
+        "anticipation": anticipation,
+        "random_state": random.getstate(),
+    }
+
+
+def test_compiled_reelstrip_tables(gamestate):
+    for reelstrip_id, reelstrip in gamestate.config.reels.items():
+        compiled = gamestate.get_compiled_reelstrip(reelstrip_id)
+        for reel, strip in enumerate(reelstrip):
+            rows = gamestate.config.num_rows[reel]
+            for stop, _ in enumerate(strip):
+                window = [strip[(stop + row) % len(strip)] for row in range(rows)]
+                assert list(compiled.windows[reel][stop]) == window
+                assert compiled.top_padding[reel][stop] == strip[stop - 1]
+                assert compiled.bottom_padding[reel][stop] == strip[(stop + rows) % len(strip)]
+                specials = [
+                    (row, special_type)
+                    for row, name in enumerate(window)
+                    for special_type, names in gamestate.config.special_symbols.items()
+                    if name in names
+                ]
+                assert list(compiled.special_positions[reel][stop]) == specials
+                assert list(compiled.special_rows[reel][stop]) == sorted({row for row, _ in specials})
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_compiled_board_matches_position_scan(gamestate, seed):
+    random.seed(seed)
+    expected = draw_board_by_position(gamestate)
+    random.seed(seed)
+    gamestate.create_board_reelstrips()
+
+    assert gamestate.reelstrip_id == expected["reelstrip_id"]
+    assert gamestate.reel_positions == expected["reel_positions"]
+    assert board_names(gamestate.board) == board_names(expected["board"])
+    assert [sym.get_attributes() for reel in gamestate.board for sym in reel] == [
+        sym.get_attributes() for reel in expected["board"] for sym in reel
+    ]
+    assert [sym.name for sym in gamestate.top_symbols] == [sym.name for sym in expected["top_symbols"]]
+    assert [sym.name for sym in gamestate.bottom_symbols] == [sym.name for sym in expected["bottom_symbols"]]
+    assert gamestate.special_syms_on_board == expected["special_syms_on_board"]
+    assert gamestate.anticipation == expected["anticipation"]
+    assert random.getstate() == expected["random_state"]
+
+
+def scan_symbol_stops(strip: list, names: list) -> list:
+    """Strip positions holding any of names."""
+    return [stop for stop, name in enumerate(strip) if name in names]
+
+
+@pytest.mark.parametrize("target", ["scatter", "wild", "multiplier", "H1", "L2"])
+def test_stop_index_matches_strip_scan(gamestate, target):
+    names = gamestate.config.special_symbols.get(target, [target])
+    for reelstrip_id, reelstrip in gamestate.config.reels.items():
+        compiled = gamestate.get_compiled_reelstrip(reelstrip_id)
+        assert compiled.get_symbol_stops(target) == [scan_symbol_stops(strip, names) for strip in reelstrip]
+        assert gamestate.get_syms_on_reel(reelstrip_id, target) == compiled.get_symbol_stops(target)
+        for reel, strip in enumerate(reelstrip):
+            rows = gamestate.config.num_rows[reel]
+            stops_by_count = {}
+            for stop, _ in enumerate(strip):
+                count = sum(strip[(stop + row) % len(strip)] in names for row in range(rows))
+                stops_by_count.setdefault(count, []).append(stop)
+            assert compiled.get_window_stops(target)[reel] == stops_by_count
+
+
+@pytest.mark.parametrize("force_criteria, num_force_syms", [("scatter", 2), ("scatter", 3), ("H1", 4)])
+def test_force_special_board_count(gamestate, force_criteria, num_force_syms):
+    random.seed(5)
+    for _ in range(20):
+        gamestate.force_special_board(force_criteria, num_force_syms)
+        if force_criteria in gamestate.config.special_symbols:
+            assert gamestate.count_special_symbols(force_criteria) == num_force_syms
+        else:
+            assert gamestate.count_symbols_on_board(force_criteria) == num_force_syms
+
+
+@pytest.mark.parametrize("sampler", ["sample_forced_board", "sample_exact_board"])
+@pytest.mark.parametrize("num_force_syms", [0, 1, 3, 4])
+def test_forced_board_samplers_count(gamestate, sampler, num_force_syms):
+    random.seed(11)
+    for _ in range(50):
+        getattr(gamestate, sampler)("scatter", num_force_syms)
+        assert gamestate.count_special_symbols("scatter") == num_force_syms
+        assert sum(name == "S" for reel in board_names(gamestate.board) for name in reel) == num_force_syms
+
+
+@pytest.mark.parametrize("sampler", ["sample_forced_board", "sample_exact_board"])
+def test_forced_board_samplers_reproducible(gamestate, sampler):
+    draws = []
+    for _ in range(2):
+        random.seed(23)
+        boards = []
+        for _ in range(20):
+            getattr(gamestate, sampler)("scatter", 3)
+            boards.append((gamestate.reelstrip_id, list(gamestate.reel_positions), board_names(gamestate.board)))
+        draws.append(boards)
+    assert draws[0] == draws[1]
+
+
+@pytest.mark.parametrize("sampler", ["sample_forced_board", "sample_exact_board"])
+def test_forced_board_samplers_unreachable_count(gamestate, sampler):
+    with pytest.raises(RuntimeError):
+        getattr(gamestate, sampler)("scatter", 6)
+
+
+def test_stacked_count_only_reachable_by_exact_sampler(gamestate):
+    with pytest.raises(RuntimeError):
+        gamestate.sample_forced_board("scatter", 5)
+    random.seed(4)
+    gamestate.sample_exact_board("scatter", 5)
+    assert gamestate.count_special_symbols("scatter") == 5
+
+
+def test_forced_board_sampler_without_target_free_window():
+    config = GameBoardConfig()
+    for reelstrip in config.reels.values():
+        reelstrip[0] = ["S"] * 10
+    gamestate = BoardTest(config)
+    assert not gamestate.can_sample_forced_board("BR0", "scatter", 3)
+    with pytest.raises(RuntimeError):
+        gamestate.sample_forced_board("scatter", 3)
+
+    random.seed(2)
+    gamestate.sample_exact_board("scatter", 4)
+    assert gamestate.count_special_symbols("scatter") == 4
+
+
+@pytest.mark.parametrize("num_force_syms", [1, 2, 3])
+def test_forced_board_sampler_forces_reels_without_target_free_window(num_force_syms):
+    config = GameBoardConfig()
+    for reelstrip in config.reels.values():
+        reelstrip[0] = ["S", "L1", "L2"] * 4
+    gamestate = BoardTest(config)
+    random.seed(num_force_syms)
+    for _ in range(20):
+        gamestate.sample_forced_board("scatter", num_force_syms)
+        assert gamestate.count_special_symbols("scatter") == num_force_syms
+        assert "S" in board_names(gamestate.board)[0]
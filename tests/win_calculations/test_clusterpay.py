@@ -1,5 +1,6 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
@@ -99,3 +100,27 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_clusters_match_recursive(gamestate):
+    rng = random.Random(0)
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["H1", "H2", "WM", "X"]))
+
+        assert Cluster.get_clusters(gamestate.board) == Cluster.get_clusters_recursive(gamestate.board)
+
+
+def test_bitboard_clusters_match(gamestate):
+    rng = random.Random(1)
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["H1", "H2", "WM", "X"]))
+
+        clusters = Cluster.get_clusters(gamestate.board)
+        bitboard_clusters = Cluster.get_clusters_bitboard(gamestate.board)
+        assert list(clusters) == list(bitboard_clusters)
+        for symbol in clusters:
+            assert [sorted(c) for c in clusters[symbol]] == bitboard_clusters[symbol]
@@ -1,8 +1,10 @@
 """Test basic lines-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
-from src.calculations.lines import Lines
+from src.calculations import lines
+from src.calculations.lines import Lines, CompiledPaylines, get_compiled_paylines
 
 
 class GameLinesConfig:
@@ -122,3 +124,68 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_compiled_lines_match(gamestate):
+    """Compiled paylines give the same wins as the reel by reel evaluation."""
+    rng = random.Random(0)
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["W", "WM", "H1", "X"]))
+
+        windata = Lines.get_lines(gamestate.board, gamestate.config)
+        assert Lines.get_lines_compiled(gamestate.board, gamestate.config) == windata
+
+
+def set_many_paylines(config, seed: int = 0) -> None:
+    """Replace the paylines with enough random lines for get_lines to use CompiledPaylines."""
+    rng = random.Random(seed)
+    config.paylines = {
+        line_index: [rng.randrange(rows) for rows in config.num_rows]
+        for line_index in range(1, lines.COMPILED_PAYLINES_MIN_LINES + 11)
+    }
+
+
+@pytest.mark.parametrize("multiplier_method", ["symbol", "global", "combined"])
+def test_get_lines_compiled_path(gamestate, monkeypatch, multiplier_method):
+    """With many paylines get_lines evaluates them with CompiledPaylines, matching the reel by reel evaluation."""
+    set_many_paylines(gamestate.config)
+    evaluate_calls = []
+    evaluate = CompiledPaylines.evaluate
+
+    def count_evaluate(self, *args):
+        evaluate_calls.append(1)
+        return evaluate(self, *args)
+
+    monkeypatch.setattr(CompiledPaylines, "evaluate", count_evaluate)
+
+    rng = random.Random(1)
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["W", "WM", "H1", "X"]))
+        kwargs = {"multiplier_method": multiplier_method, "global_multiplier": 3}
+
+        num_calls = len(evaluate_calls)
+        windata = Lines.get_lines(gamestate.board, gamestate.config, **kwargs)
+        assert len(evaluate_calls) == num_calls + 1
+        with monkeypatch.context() as plain:
+            plain.setattr(lines, "COMPILED_PAYLINES_MIN_LINES", len(gamestate.config.paylines) + 1)
+            assert Lines.get_lines(gamestate.board, gamestate.config, **kwargs) == windata
+        assert len(evaluate_calls) == num_calls + 1
+
+
+def test_compiled_paylines_cache(gamestate):
+    set_many_paylines(gamestate.config)
+    compiled = get_compiled_paylines(gamestate.config)
+    assert get_compiled_paylines(gamestate.config) is compiled
+
+    other_config = GameLinesConfig()
+    other_config.paylines = {line_index: list(line) for line_index, line in gamestate.config.paylines.items()}
+    assert get_compiled_paylines(other_config) is compiled
+
+    gamestate.config.paylines[1][0] = (gamestate.config.paylines[1][0] + 1) % gamestate.config.num_rows[0]
+    recompiled = get_compiled_paylines(gamestate.config)
+    assert recompiled is not compiled
+    assert recompiled.line_rows[0].tolist() == gamestate.config.paylines[1]
@@ -1,8 +1,9 @@
 """Test basic scatterpay-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
-from src.calculations.scatter import Scatter
+from src.calculations.scatter import Scatter, ScatterBoardCounts
 
 
 class GameScatterConfig:
@@ -103,3 +104,26 @@ def test_scatterpay_wilds(gamestate):
             assert wd["win"] == 3
 
     assert windata["totalWin"] == 53
+
+
+def test_scatterpay_incremental(gamestate):
+    "Incremental evaluation matches a full evaluation as exploded symbols are replaced between evaluations"
+    rng = random.Random(0)
+    board_counts = ScatterBoardCounts(gamestate.config)
+    for _ in range(20):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["W", "WM", "H1", "H2"]))
+        board_counts.count_board(gamestate.board)
+
+        windata = Scatter.get_scatterpay_wins_incremental(gamestate.config, gamestate.board, board_counts, verify=True)
+        while windata["totalWin"] > 0:
+            for reel in gamestate.board:
+                remaining = [sym for sym in reel if not sym.check_attribute("explode")]
+                num_exploded = len(reel) - len(remaining)
+                refill = [gamestate.create_symbol(rng.choice(["W", "H1", "H2"])) for _ in range(num_exploded)]
+                reel[:] = refill + remaining
+            board_counts.update_from_tumble(gamestate.board)
+            windata = Scatter.get_scatterpay_wins_incremental(
+                gamestate.config, gamestate.board, board_counts, verify=True
+            )
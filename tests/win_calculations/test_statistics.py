@@ -0,0 +1,94 @@
+"""Test weighted sampling against the linear-scan draw."""
+
+import random
+import pytest
+from src.calculations.statistics import (
+    get_random_outcome,
+    get_sampler,
+    rebuild_sampler,
+    set_alias_sampling,
+    set_sampler_check,
+    WeightedSampler,
+)
+
+
+def linear_scan_outcome(distribution: dict, total_weight: float = None):
+    """Original get_random_outcome, scanning the cumulative weights in order."""
+    if total_weight is None:
+        total_weight = sum(distribution.values())
+    roll = random.uniform(0, total_weight)
+    cumulative = 0.0
+    for value, weight in distribution.items():
+        cumulative += weight
+        if cumulative >= roll:
+            return value
+    return None
+
+
+DISTRIBUTIONS = [
+    {2: 100, 3: 50, 5: 20, 10: 5, 50: 1},
+    {"H1": 0.1, "H2": 0, "L1": 0.35, "L2": 0.55},
+    {1: 1},
+    {0: 0, 1: 3, 2: 0, 3: 7},
+]
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_sampler_matches_linear_scan(distribution):
+    for total_weight in [None, sum(distribution.values())]:
+        random.seed(42)
+        expected = [linear_scan_outcome(distribution, total_weight) for _ in range(2000)]
+        random.seed(42)
+        assert [get_random_outcome(distribution, total_weight) for _ in range(2000)] == expected
+
+
+def test_rebuild_sampler_after_in_place_changes():
+    distribution = {1: 10, 2: 10, 3: 10}
+    sampler = get_sampler(distribution)
+    distribution[2] = 0
+    distribution[3] = 50
+    assert get_sampler(distribution) is sampler
+    rebuild_sampler(distribution)
+    random.seed(7)
+    expected = [linear_scan_outcome(distribution) for _ in range(500)]
+    random.seed(7)
+    assert [get_random_outcome(distribution) for _ in range(500)] == expected
+    assert get_sampler(distribution).weights == (10, 0, 50)
+
+
+def test_sampler_check_raises_on_in_place_changes():
+    distribution = {1: 10, 2: 10, 3: 10}
+    get_random_outcome(distribution)
+    distribution[3] = 50
+    set_sampler_check(True)
+    try:
+        with pytest.raises(RuntimeError, match="rebuild_sampler"):
+            get_random_outcome(distribution)
+        rebuild_sampler(distribution)
+        get_random_outcome(distribution)
+    finally:
+        set_sampler_check(False)
+
+
+def test_alias_tables_built_on_first_alias_draw():
+    sampler = WeightedSampler({1: 3, 2: 1})
+    assert sampler.alias_probs is None
+    sampler.sample()
+    assert sampler.alias_probs is None
+    sampler.sample_alias()
+    assert sampler.alias_probs is not None
+
+
+def test_alias_draws():
+    distribution = {2: 100, 3: 50, 5: 20, 10: 0, 50: 30}
+    set_alias_sampling(True)
+    try:
+        random.seed(3)
+        draws = [get_random_outcome(distribution) for _ in range(40000)]
+        random.seed(3)
+        assert [get_random_outcome(distribution) for _ in range(40000)] == draws
+    finally:
+        set_alias_sampling(False)
+    total_weight = sum(distribution.values())
+    for value, weight in distribution.items():
+        assert draws.count(value) / len(draws) == pytest.approx(weight / total_weight, abs=0.01)
@@ -0,0 +1,62 @@
+"""Test symbol attribute flags and symbol copies."""
+
+import pytest
+from src.calculations.symbol import Symbol, SymbolStorage
+
+
+class SymbolConfig:
+    """Minimal configuration for creating symbols."""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (3, "W"): 10}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"]}
+
+
+def assert_flags_consistent(symbol):
+    """check_attribute must agree with the stored attribute values."""
+    for attribute in ["wild", "scatter", "multiplier", "explode", "prize"]:
+        expected = attribute in symbol.get_attributes() and symbol.get_attributes()[attribute] is not False
+        assert symbol.check_attribute(attribute) == expected, attribute
+
+
+def test_attribute_flags():
+    symbol = Symbol(SymbolConfig(), "W")
+    assert symbol.check_attribute("wild") and symbol.check_attribute("multiplier")
+    assert not symbol.check_attribute("scatter")
+    assert symbol.check_attribute("scatter", "wild")
+    assert_flags_consistent(symbol)
+
+    symbol.assign_attribute({"multiplier": 3, "explode": True})
+    assert symbol.get_attribute("multiplier") == 3
+    assert_flags_consistent(symbol)
+
+    symbol.explode = False
+    assert not symbol.check_attribute("explode")
+    assert_flags_consistent(symbol)
+
+    del symbol.wild
+    assert not symbol.check_attribute("wild")
+    assert not hasattr(symbol, "wild")
+    assert_flags_consistent(symbol)
+
+    with pytest.raises(AttributeError):
+        del symbol.prize
+
+
+def test_symbol_copies_are_independent():
+    storage = SymbolStorage(SymbolConfig(), ["W", "H1", "S"])
+    prototype = storage.get_prototype("W")
+
+    board_symbol = storage.create_symbol_state("W")
+    board_symbol.assign_attribute({"multiplier": 5, "explode": True})
+    board_symbol.register_special_function(print)
+    retrieved = storage.get_symbol("W")
+    retrieved.assign_attribute({"prize": 20})
+    del retrieved.wild
+
+    assert prototype.get_attribute("multiplier") is True and prototype.special_functions == []
+    assert not prototype.check_attribute("explode", "prize") and prototype.check_attribute("wild")
+    fresh = storage.create_symbol_state("W")
+    assert fresh.get_attributes() == {"wild": True, "multiplier": True}
+    assert fresh.flags == prototype.flags and fresh.special_functions == []
+    assert storage.get_symbol("W") is not storage.get_symbol("W")
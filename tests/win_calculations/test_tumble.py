@@ -0,0 +1,108 @@
+"""Test in-place tumbles against the original copy-and-insert tumble."""
+
+import random
+import pytest
+from src.calculations.tumble import Tumble
+from src.events.events import copy_payload
+from tests.win_calculations.test_board import GameBoardConfig, BoardTest, board_names
+
+
+class TumbleTest(BoardTest, Tumble):
+    """Board drawn from reelstrips, with tumble actions."""
+
+
+def copy_insert_tumble_board(gamestate) -> None:
+    """Original tumble_board, inserting refills into copied reels and rescanning the whole board."""
+    static_board = [list(reel) for reel in gamestate.board]
+    gamestate.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
+    for reel, _ in enumerate(static_board):
+        copy_reel = static_board[reel]
+        reelstrip = gamestate.reelstrip[reel]
+        exploding_symbols = sum(1 for x in copy_reel if x.check_attribute("explode"))
+        for i in range(exploding_symbols):
+            reel_pos = (gamestate.reel_positions[reel] - 1) % len(reelstrip)
+            gamestate.reel_positions[reel] = reel_pos
+            if i == 0 and gamestate.config.include_padding:
+                insert_sym = gamestate.top_symbols[reel]
+            else:
+                insert_sym = gamestate.create_symbol(reelstrip[reel_pos])
+                gamestate.new_symbols_from_tumble[reel].insert(0, insert_sym)
+            copy_reel.insert(0, insert_sym)
+        static_board[reel] = [sym for sym in copy_reel if not sym.check_attribute("explode")]
+        if gamestate.config.include_padding and exploding_symbols > 0:
+            padding_name = str(reelstrip[(gamestate.reel_positions[reel] - 1) % len(reelstrip)])
+            gamestate.top_symbols[reel] = gamestate.create_symbol(padding_name)
+            gamestate.new_symbols_from_tumble[reel].insert(0, gamestate.top_symbols[reel])
+    gamestate.board = static_board
+    gamestate.get_special_symbols_on_board()
+
+
+def run_tumbles(include_padding: bool, seed: int, tumble) -> list:
+    """Draw a board and tumble it three times, exploding random positions. Returns the state after each tumble."""
+    config = GameBoardConfig()
+    config.include_padding = include_padding
+    config.snapshot_tumble_board = False
+    gamestate = TumbleTest(config)
+    random.seed(seed)
+    explode_rng = random.Random(seed)
+    gamestate.create_board_reelstrips()
+    states = []
+    for _ in range(3):
+        held_positions = [pos for positions in gamestate.special_syms_on_board.values() for pos in positions]
+        for reel in gamestate.board:
+            for symbol in reel:
+                if explode_rng.random() < 0.3:
+                    symbol.assign_attribute({"explode": True})
+        tumble(gamestate)
+        new_positions = [pos for positions in gamestate.special_syms_on_board.values() for pos in positions]
+        assert not any(new is held for new in new_positions for held in held_positions)
+        states.append(
+            {
+                "board": board_names(gamestate.board),
+                "attributes": [[dict(sym.get_attributes()) for sym in reel] for reel in gamestate.board],
+                "new_symbols": board_names(gamestate.new_symbols_from_tumble),
+                "top_symbols": [sym.name for sym in gamestate.top_symbols] if include_padding else None,
+                "reel_positions": list(gamestate.reel_positions),
+                "special_syms_on_board": copy_payload(gamestate.special_syms_on_board),
+            }
+        )
+    return states
+
+
+@pytest.mark.parametrize("include_padding", [True, False])
+@pytest.mark.parametrize("seed", range(20))
+def test_tumble_matches_copy_insert(include_padding, seed):
+    expected = run_tumbles(include_padding, seed, copy_insert_tumble_board)
+    assert run_tumbles(include_padding, seed, Tumble.tumble_board) == expected
+
+
+class WildMultiplierTumbleTest(TumbleTest):
+    """Wilds are given a multiplier attribute, without being listed as multiplier symbols."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.special_symbol_functions["W"] = [self.assign_mult_property]
+
+
+@pytest.mark.parametrize("forced", [True, False])
+@pytest.mark.parametrize("seed", range(20))
+def test_tumble_special_symbols_match_attribute_scan(forced, seed):
+    config = GameBoardConfig()
+    config.snapshot_tumble_board = False
+    gamestate = WildMultiplierTumbleTest(config)
+    random.seed(seed)
+    explode_rng = random.Random(seed)
+    if forced:
+        wild_stop = gamestate.config.reels["BR0"][0].index("W")
+        gamestate.force_board_from_reelstrips("BR0", {0: wild_stop})
+    else:
+        gamestate.create_board_reelstrips()
+    for _ in range(3):
+        for reel in gamestate.board[1:]:
+            for symbol in reel:
+                if explode_rng.random() < 0.3:
+                    symbol.assign_attribute({"explode": True})
+        gamestate.tumble_board()
+        tumbled = copy_payload(gamestate.special_syms_on_board)
+        gamestate.get_special_symbols_on_board()
+        assert tumbled == gamestate.special_syms_on_board
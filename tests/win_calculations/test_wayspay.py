@@ -1,8 +1,12 @@
 """Test basic ways-calculation functionality."""
 
+import json
+import random
+from collections import defaultdict
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.ways import Ways
+from src.wins.multiplier_strategy import apply_mult
 
 
 class GameWaysConfig:
@@ -136,3 +140,154 @@ def test_global_multiplier_strategy(gamestate):
     expected_win = base_win * global_mult
 
     assert windata["totalWin"] == expected_win, f"Expected {expected_win}, got {windata['totalWin']}"
+
+
+def per_position_ways_data(
+    config,
+    board,
+    wild_key="wild",
+    global_multiplier=1,
+    multiplier_key="multiplier",
+    multiplier_strategy="symbol",
+):
+    """Original get_ways_data, recording every position of each potential win before counting ways."""
+    return_data = {
+        "totalWin": 0,
+        "wins": [],
+    }
+    assert multiplier_strategy in ["symbol", "board", "global"]
+    board_mult_count = 0
+    potential_wins = defaultdict()
+    wilds = [[] for _ in range(len(board))]
+    for reel, _ in enumerate(board):
+        for row, _ in enumerate(board[reel]):
+            sym = board[reel][row]
+            if reel == 0 and sym.name not in potential_wins:
+                potential_wins[sym.name] = [[] for _ in range(len(board))]
+                potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
+            elif sym.name in potential_wins:
+                potential_wins[sym.name][reel].append({"reel": reel, "row": row})
+
+            if sym.name in config.special_symbols[wild_key]:
+                wilds[reel].append({"reel": reel, "row": row})
+                if board[reel][row].check_attribute(multiplier_key):
+                    wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
+
+    for symbol in potential_wins:
+        kind, ways, cumulative_sym_mult = (0, 1, 0)
+        for reel, _ in enumerate(potential_wins[symbol]):
+            if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
+                kind += 1
+                reel_sym_count = 0
+                # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
+                symbols_have_mult = False
+                for s in potential_wins[symbol][reel]:
+                    if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
+                        symbols_have_mult = True
+
+                if symbols_have_mult is False:
+                    reel_sym_count += len(potential_wins[symbol][reel])
+                else:
+                    reel_sym_count = 0
+                    for s in potential_wins[symbol][reel]:
+                        if (
+                            board[s["reel"]][s["row"]].check_attribute(multiplier_key)
+                            and multiplier_strategy == "symbol"
+                        ):
+                            reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
+                        else:
+                            reel_sym_count += 1
+                            if (
+                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
+                                and multiplier_strategy == "board"
+                            ):
+                                gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
+                                board_mult_count += gm * (gm > 1)
+
+                if len(wilds[reel]) > 0:
+                    for sym in wilds[reel]:
+                        if board[sym["reel"]][sym["row"]].check_attribute(
+                            multiplier_key
+                        ) and multiplier_strategy in ["board", "symbol"]:
+                            wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
+                            cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
+                            if multiplier_strategy == "board":
+                                reel_sym_count += 1
+                                board_mult_count += wild_mult_val * (wild_mult_val > 1)
+                            else:
+                                reel_sym_count += wild_mult_val
+                        else:
+                            reel_sym_count += 1
+
+                ways *= reel_sym_count
+
+            else:
+                break
+
+        match multiplier_strategy:
+            case "global":
+                win_multiplier = global_multiplier
+            case "board":
+                win_multiplier = max(board_mult_count, 1)
+            case "symbol":
+                win_multiplier = 1
+
+        if (kind, symbol) in config.paytable:
+            positions = []
+            for reel in range(kind):
+                for pos in potential_wins[symbol][reel]:
+                    positions += [pos]
+                for pos in wilds[reel]:
+                    positions += [pos]
+
+            win = round(config.paytable[kind, symbol] * ways, 2)
+            win_amt, multiplier = apply_mult(
+                board=board,
+                strategy="global",
+                win_amount=win,
+                global_multiplier=win_multiplier,
+            )
+            if multiplier_strategy == "symbol":
+                assert win_amt == win
+
+            return_data["wins"] += [
+                {
+                    "symbol": symbol,
+                    "kind": kind,
+                    "win": win_amt,
+                    "positions": positions,
+                    "meta": {
+                        "ways": ways,
+                        "globalMult": multiplier,
+                        "winWithoutMult": win,
+                        "symbolMult": cumulative_sym_mult,
+                    },
+                }
+            ]
+            return_data["totalWin"] += win_amt
+
+    return return_data
+
+
+def create_random_ways_board(gamestate, rng: random.Random) -> list:
+    """Board of uneven reel heights with multiplier wilds and symbols."""
+    board = []
+    for _ in range(gamestate.config.num_reels):
+        reel = []
+        for _ in range(rng.randint(2, 5)):
+            sym = gamestate.create_symbol(rng.choice(["H1", "H1", "H2", "H2", "W", "X", "S"]))
+            if sym.name in ["W", "H1"] and rng.random() < 0.4:
+                setattr(sym, "multiplier", rng.choice([1, 2, 3, 5]))
+            reel.append(sym)
+        board.append(reel)
+    return board
+
+
+@pytest.mark.parametrize("multiplier_strategy", ["symbol", "board", "global"])
+def test_ways_match_per_position_evaluation(gamestate, multiplier_strategy):
+    rng = random.Random(multiplier_strategy)
+    for _ in range(500):
+        board = create_random_ways_board(gamestate, rng)
+        kwargs = {"global_multiplier": rng.choice([1, 4]), "multiplier_strategy": multiplier_strategy}
+        expected = per_position_ways_data(gamestate.config, board, **kwargs)
+        assert json.dumps(Ways.get_ways_data(gamestate.config, board, **kwargs)) == json.dumps(expected)
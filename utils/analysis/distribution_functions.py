@@ -2,21 +2,34 @@ from collections import defaultdict
 from math import sqrt
 import numpy as np
 
+from src.write_data.binary_lookup import load_binary_lookup
+
 
 def get_lookup_length(filepath: str) -> int:
     """Get length of lookup table."""
+    lookup = load_binary_lookup(filepath)
+    if lookup is not None:
+        return len(lookup)
     return sum(1 for _ in open(filepath, "rb"))
 
 
 def make_win_distribution(filepath: str, normalize: bool = True) -> dict:
     """Construct win-distribution with unique, ordered payouts."""
     dist = defaultdict(float)
-    with open(filepath, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = int(weight)
-            payout = float(payout) / 100
-            dist[payout] += weight
+    lookup = load_binary_lookup(filepath)
+    if lookup is not None:
+        payouts, payout_index = np.unique(lookup["payout"], return_inverse=True)
+        weights = np.zeros(len(payouts), dtype=np.uint64)
+        np.add.at(weights, payout_index, lookup["weight"])
+        for payout, weight in zip(payouts.tolist(), weights.tolist()):
+            dist[float(payout) / 100] = weight
+    else:
+        with open(filepath, "r", encoding="UTF-8") as f:
+            for line in f:
+                _, weight, payout = line.strip().split(",")
+                weight = int(weight)
+                payout = float(payout) / 100
+                dist[payout] += weight
 
     # Sort by win amount
     dist = dict(sorted(dist.items(), key=lambda x: x[0], reverse=False))
@@ -122,3 +135,101 @@ def min_dist_difference(dist: dict):
         if diff is None or (diff > abs(wins[i + 1]) - wins[i]):
             diff = abs(wins[i + 1]) - wins[i]
     return int(round(diff * 100))
+
+
+class WinDistribution:
+    """
+    Array-based win distribution, built once from a lookup table or win-distribution dict.
+    Payouts are sorted and unique, with aggregated weights and a cumulative weight array, so each
+    statistic is a single vectorized pass.
+    """
+
+    def __init__(self, payouts, weights, num_events: int = None):
+        payouts = np.asarray(payouts, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        self.payouts, payout_index = np.unique(payouts, return_inverse=True)
+        self.weights = np.bincount(payout_index.ravel(), weights=weights, minlength=len(self.payouts))
+        self.cumulative_weights = np.cumsum(self.weights)
+        self.total_weight = float(self.cumulative_weights[-1]) if len(self.payouts) > 0 else 0.0
+        self.probabilities = self.weights / self.total_weight
+        self.num_events = len(payouts) if num_events is None else num_events
+
+    @classmethod
+    def from_lookup(cls, filepath: str) -> "WinDistribution":
+        """Load an id,weight,payout lookup table, using the binary table if present."""
+        lookup = load_binary_lookup(filepath)
+        if lookup is not None:
+            weights, payouts = lookup["weight"], lookup["payout"]
+        else:
+            table = np.loadtxt(filepath, delimiter=",", dtype=np.uint64, ndmin=2)
+            weights, payouts = table[:, 1], table[:, 2]
+        return cls(payouts / 100, weights)
+
+    @classmethod
+    def from_dict(cls, dist: dict) -> "WinDistribution":
+        """Build from a {payout: weight} win-distribution, as returned by make_win_distribution."""
+        return cls(list(dist.keys()), list(dist.values()))
+
+    def to_dict(self, normalize: bool = True) -> dict:
+        """Ordered {payout: weight} dict."""
+        weights = self.probabilities if normalize else self.weights
+        return dict(zip(self.payouts.tolist(), weights.tolist()))
+
+    def average(self) -> float:
+        """Weighted average payout."""
+        return float(np.dot(self.payouts, self.probabilities))
+
+    def rtp(self, bet_cost: float) -> float:
+        """Return to player, relative to the mode cost."""
+        return self.average() / bet_cost
+
+    def moments(self) -> tuple:
+        """Variance, standard deviation, skewness and excess kurtosis."""
+        deviation = self.payouts - self.average()
+        variance = float(np.dot(deviation**2, self.probabilities))
+        standard_dev = sqrt(variance)
+        skewness = float(np.dot(deviation**3, self.probabilities)) / standard_dev**3
+        kurtosis = float(np.dot(deviation**4, self.probabilities)) / standard_dev**4 - 3
+        return variance, standard_dev, skewness, kurtosis
+
+    def quantile(self, q: float) -> float:
+        """Smallest payout with cumulative probability >= q."""
+        index = np.searchsorted(self.cumulative_weights, q * self.total_weight, side="left")
+        return float(self.payouts[min(index, len(self.payouts) - 1)])
+
+    def median(self) -> float:
+        """Median payout."""
+        return self.quantile(0.5)
+
+    def probability(self, min_win: float = None, max_win: float = None) -> float:
+        """Probability of min_win <= payout < max_win, either bound may be omitted."""
+        start = 0 if min_win is None else np.searchsorted(self.payouts, min_win, side="left")
+        end = len(self.payouts) if max_win is None else np.searchsorted(self.payouts, max_win, side="left")
+        return float(self.weights[start:end].sum()) / self.total_weight
+
+    def hit_rate(self, min_win: float = None, max_win: float = None) -> float:
+        """Inverse probability of min_win <= payout < max_win, 0 if the range is never hit."""
+        prob = self.probability(min_win, max_win)
+        return 1 / prob if prob > 0 else 0
+
+    def prob_no_win(self) -> float:
+        """Probability of a 0x payout."""
+        return float(self.probabilities[0]) if self.payouts[0] == 0 else 0
+
+    def prob_less_than_bet(self, bet_cost: float) -> float:
+        """Probability of winning less than the mode cost."""
+        return self.probability(max_win=bet_cost)
+
+    def non_zero_hitrate(self) -> float:
+        """Inverse probability of any non-zero payout."""
+        return 1 / (1 - self.prob_no_win())
+
+    def maxwin_hitrate(self) -> float:
+        """Inverse probability of the largest payout."""
+        return 1 / float(self.probabilities[-1])
+
+    def min_difference(self) -> int:
+        """Smallest gap between consecutive unique payouts, in cents."""
+        if len(self.payouts) < 2:
+            return 0
+        return int(round(float(np.diff(self.payouts).min()) * 100))
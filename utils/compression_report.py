@@ -0,0 +1,112 @@
+"""Compare zstd compression settings for published books files, reporting compression ratio and throughput."""
+
+from pathlib import Path
+import argparse
+import sys
+import os
+import json
+import time
+import zstandard as zstd
+
+ABS_PATH = Path(__file__).parent.parent
+sys.path.append(str(ABS_PATH))
+os.chdir(ABS_PATH)
+
+from src.write_data.write_data import get_zstd_params
+from utils.decompress_zstd import get_books_decompressor
+
+# (level, threads, ldm_window_log)
+DEFAULT_SETTINGS = [
+    (3, 0, None),
+    (3, -1, None),
+    (3, -1, 27),
+    (9, -1, None),
+    (9, -1, 27),
+    (19, -1, 27),
+]
+
+
+def load_books(books_file: str, max_bytes: int = None) -> bytes:
+    """Read uncompressed JSONL books from a .jsonl or .jsonl.zst file, optionally truncated to max_bytes."""
+    read_size = -1 if max_bytes is None else max_bytes
+    with open(books_file, "rb") as f:
+        if books_file.endswith(".zst"):
+            decompressor = get_books_decompressor(books_file)
+            with decompressor.stream_reader(f, read_across_frames=True) as reader:
+                return reader.read(read_size)
+        return f.read(read_size)
+
+
+def compression_report(books_file: str, settings: list = None, max_bytes: int = None) -> list:
+    """
+    Compress books with each (level, threads, ldm_window_log) setting.
+    Throughput is measured against uncompressed size in MB/s.
+    """
+    if settings is None:
+        settings = DEFAULT_SETTINGS
+    raw_data = load_books(books_file, max_bytes)
+    assert len(raw_data) > 0, f"No book data found in {books_file}"
+    raw_mb = len(raw_data) / 1e6
+
+    report = []
+    for level, threads, ldm_window_log in settings:
+        params = get_zstd_params(level, threads, ldm_window_log)
+        compressor = zstd.ZstdCompressor(compression_params=params)
+        start_time = time.time()
+        compressed = compressor.compress(raw_data)
+        compress_time = time.time() - start_time
+
+        start_time = time.time()
+        zstd.ZstdDecompressor(max_window_size=2**31).decompress(compressed)
+        decompress_time = time.time() - start_time
+
+        report.append(
+            {
+                "level": level,
+                "threads": threads,
+                "ldm_window_log": ldm_window_log,
+                "compressed_mb": round(len(compressed) / 1e6, 3),
+                "ratio": round(len(raw_data) / len(compressed), 3),
+                "compress_mb_s": round(raw_mb / max(compress_time, 1e-9), 1),
+                "decompress_mb_s": round(raw_mb / max(decompress_time, 1e-9), 1),
+            }
+        )
+    return report
+
+
+def print_report(report: list, books_file: str) -> None:
+    """Print a compression summary table."""
+    print(f"\nCompression report: {books_file}")
+    print(f"{'level':>6}{'threads':>9}{'ldm':>6}{'size(MB)':>11}{'ratio':>9}{'comp MB/s':>11}{'decomp MB/s':>13}")
+    for row in report:
+        ldm = "-" if row["ldm_window_log"] is None else row["ldm_window_log"]
+        print(
+            f"{row['level']:>6}{row['threads']:>9}{ldm:>6}{row['compressed_mb']:>11}{row['ratio']:>9}"
+            f"{row['compress_mb_s']:>11}{row['decompress_mb_s']:>13}"
+        )
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="game_id", type=str, help="Enter str format for game_id: '0_0_0'")
+    parser.add_argument("-m", dest="game_mode", type=str, help="Enter str format: 'base', 'bonus', etc... ")
+    parser.add_argument("-f", dest="books_file", type=str, help="Path to a books file, overrides game_id/mode")
+    parser.add_argument("-b", dest="max_bytes", type=int, help="Limit the uncompressed sample size in bytes")
+    parser.add_argument(
+        "-s", dest="settings", type=str, help="JSON list of [level, threads, ldm_window_log]: '[[3, -1, null]]'"
+    )
+
+    arguments = parser.parse_args()
+
+    if arguments.books_file is not None:
+        target_file = arguments.books_file
+    else:
+        target_file = os.path.join(
+            "games", arguments.game_id, "library", "publish_files", f"books_{arguments.game_mode}.jsonl.zst"
+        )
+    target_settings = None
+    if arguments.settings is not None:
+        target_settings = [tuple(s) for s in json.loads(arguments.settings)]
+
+    print_report(compression_report(target_file, target_settings, arguments.max_bytes), target_file)
@@ -1,9 +1,20 @@
 """Test file decompression and validate data structure is valid JSON."""
 
 import json
+import os
 import zstandard as zstd
 
 
+def get_books_decompressor(input_path: str) -> zstd.ZstdDecompressor:
+    """Decompressor for a books file, using the trained dictionary published alongside it if there is one."""
+    dict_path = str(input_path).replace(".jsonl.zst", ".zdict")
+    dict_data = None
+    if dict_path != str(input_path) and os.path.exists(dict_path):
+        with open(dict_path, "rb") as f:
+            dict_data = zstd.ZstdCompressionDict(f.read())
+    return zstd.ZstdDecompressor(dict_data=dict_data, max_window_size=2**31)
+
+
 def decompress(input_path: str, save_output: bool = False):
     """Decompress zst files assuming newline char to indicate different sims."""
 
@@ -15,9 +26,9 @@ def decompress(input_path: str, save_output: bool = False):
             print("Invalid JSON!")
             raise RuntimeError("Invalid JSON")
 
-    decompressor = zstd.ZstdDecompressor()
+    decompressor = get_books_decompressor(input_path)
     with open(input_path, "rb") as f:
-        with decompressor.stream_reader(f) as reader:
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             decompressed_data = reader.read().decode("utf-8")
 
     all_sims = decompressed_data.split("\n")
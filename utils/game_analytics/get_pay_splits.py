@@ -1,5 +1,7 @@
 from src.config.paths import PATH_TO_GAMES
+from src.write_data.binary_lookup import load_binary_lookup
 from collections import defaultdict
+import numpy as np
 import os
 
 
@@ -9,6 +11,14 @@ def get_unoptimized_hits(lut_path, all_modes, win_ranges):
     total_mode_count = {}
     for mode in all_modes:
         base_lut_file = os.path.join(lut_path, "lookUpTable_" + str(mode) + ".csv")
+        lookup = load_binary_lookup(base_lut_file)
+        if lookup is not None:
+            payouts, counts = np.unique(lookup["payout"], return_counts=True)
+            for payout, count in zip(payouts.tolist(), counts.tolist()):
+                all_modes_base_dist[mode][float(round(payout / 100, 2))] += count
+            total_mode_count[mode] = len(lookup)
+            continue
+
         lut = open(base_lut_file, "r", encoding="UTF-8")
         counter = 0
         for line in lut:
@@ -49,7 +59,6 @@ def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name=
     combined_distributions = defaultdict(lambda: defaultdict(float))
     all_modes.append("cumulative")
     split = open(split_file, "r", encoding="UTF-8")
-    lut = open(lut_file, "r", encoding="UTF-8")
 
     all_base, all_free, all_fences = [], [], []
     for line in split:
@@ -60,10 +69,15 @@ def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name=
             idv_fence = base_mode_name
         all_fences.append(str(idv_fence))
 
-    all_weights = []
-    for line in lut:
-        _, weight, _ = line.strip().split(",")
-        all_weights.append(int(weight))
+    lookup = load_binary_lookup(lut_file)
+    if lookup is not None:
+        all_weights = lookup["weight"].tolist()
+    else:
+        all_weights = []
+        with open(lut_file, "r", encoding="UTF-8") as lut:
+            for line in lut:
+                _, weight, _ = line.strip().split(",")
+                all_weights.append(int(weight))
     total_lut_weight = int(sum(all_weights))
 
     for idx, _ in enumerate(all_weights):
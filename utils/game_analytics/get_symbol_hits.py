@@ -3,6 +3,7 @@
 import json
 import os
 from src.config.paths import PATH_TO_GAMES
+from src.write_data.binary_lookup import load_binary_lookup
 
 
 class HitRateCalculations:
@@ -27,15 +28,20 @@ class HitRateCalculations:
             all_keys = [d.keys() for d in file_dict]
         f.close()
 
-        lut_ids = []
-        weights = []
-        payouts = []
-        with open(lut_file, "r", encoding="UTF-8") as f:
-            for line in f:
-                lut_ids.append(int(line.strip().split(",")[0]))
-                weights.append(int(line.strip().split(",")[1]))
-                payouts.append(float(line.strip().split(",")[2]))
-        f.close()
+        lookup = load_binary_lookup(lut_file)
+        if lookup is not None:
+            weights = lookup["weight"].tolist()
+            payouts = lookup["payout"].astype(float).tolist()
+        else:
+            lut_ids = []
+            weights = []
+            payouts = []
+            with open(lut_file, "r", encoding="UTF-8") as f:
+                for line in f:
+                    lut_ids.append(int(line.strip().split(",")[0]))
+                    weights.append(int(line.strip().split(",")[1]))
+                    payouts.append(float(line.strip().split(",")[2]))
+            f.close()
 
         self.weights = weights
         self.total_weight = sum(self.weights)
@@ -0,0 +1,88 @@
+"""Random access to books published in indexed blocks (config.book_index_block_size)."""
+
+import json
+import os
+from bisect import bisect_right
+
+from utils.decompress_zstd import get_books_decompressor
+
+
+def get_index_name(books_path: str) -> str:
+    """Sidecar index written next to books_<mode>.jsonl.zst."""
+    return str(books_path).replace(".jsonl.zst", ".index.json")
+
+
+class IndexedBooks:
+    """
+    Read single books or id ranges from an indexed books file without decompressing the whole stream.
+    Each lookup seeks directly to the block holding the book and decompresses only that block.
+    """
+
+    def __init__(self, books_path: str, cache_blocks: int = 8):
+        index_name = get_index_name(books_path)
+        assert os.path.exists(index_name), f"No book index found at {index_name}"
+        with open(index_name, "r", encoding="UTF-8") as f:
+            self.blocks = json.load(f)["blocks"]
+        self.first_ids = [block[0] for block in self.blocks]
+        self.decompressor = get_books_decompressor(books_path)
+        self.books_file = open(books_path, "rb")
+        self.cache_blocks = cache_blocks
+        self.block_cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying books file."""
+        self.books_file.close()
+
+    def find_block(self, book_id: int) -> int:
+        """Index of the block containing book_id."""
+        block_index = bisect_right(self.first_ids, book_id) - 1
+        if block_index < 0 or book_id > self.blocks[block_index][1]:
+            raise KeyError(f"Book id {book_id} is not in the index.")
+        return block_index
+
+    def read_block(self, block_index: int) -> list:
+        """Decompress a single block, returning its serialized book lines."""
+        if block_index in self.block_cache:
+            return self.block_cache[block_index]
+        _, _, _, offset, length = self.blocks[block_index]
+        self.books_file.seek(offset)
+        lines = self.decompressor.decompress(self.books_file.read(length)).splitlines()
+        if len(self.block_cache) >= self.cache_blocks:
+            self.block_cache.pop(next(iter(self.block_cache)))
+        self.block_cache[block_index] = lines
+        return lines
+
+    def get_book(self, book_id: int) -> dict:
+        """Return a single book."""
+        block_index = self.find_block(book_id)
+        first_id, last_id, num_books, _, _ = self.blocks[block_index]
+        lines = self.read_block(block_index)
+        if last_id - first_id + 1 == num_books:
+            return json.loads(lines[book_id - first_id])
+        for line in lines:
+            book = json.loads(line)
+            if book["id"] == book_id:
+                return book
+        raise KeyError(f"Book id {book_id} is not in the index.")
+
+    def get_books(self, book_ids: list) -> list:
+        """Return books for a list of ids, in the order requested."""
+        return [self.get_book(book_id) for book_id in book_ids]
+
+    def get_book_range(self, first_id: int, last_id: int) -> list:
+        """Return all books with first_id <= id <= last_id."""
+        books = []
+        block_index = max(bisect_right(self.first_ids, first_id) - 1, 0)
+        while block_index < len(self.blocks) and self.blocks[block_index][0] <= last_id:
+            for line in self.read_block(block_index):
+                book = json.loads(line)
+                if first_id <= book["id"] <= last_id:
+                    books.append(book)
+            block_index += 1
+        return books
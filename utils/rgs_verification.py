@@ -11,18 +11,9 @@ import numpy as np
 import zstandard as zst
 import hashlib
 import pickle
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_distribution_moments,
-    get_distribution_average,
-    non_zero_hitrate,
-    prob_less_than_bet,
-    get_prob_no_win,
-    get_maxwin_hitrate,
-    get_distribution_median,
-    min_dist_difference,
-    calculate_rtp,
-)
+from src.write_data.binary_lookup import load_binary_lookup
+from utils.decompress_zstd import get_books_decompressor
+from utils.analysis.distribution_functions import WinDistribution
 
 
 class WinStatistics:
@@ -79,11 +70,29 @@ class WinStatistics:
 
 
 def verify_lookup_format(filename: str) -> list:
-    "Duplicate RGS verification before upload."
-    integer_payouts = []
+    """Duplicate RGS verification before upload. The win distribution is built from the same columns as the checks."""
+    integer_payouts, weights = [], []
     running_weight_total = 0
     min_win, max_win = None, None
-    win_distribution = make_win_distribution(filename)
+
+    lookup = load_binary_lookup(filename)
+    if lookup is not None:
+        payouts = np.asarray(lookup["payout"])
+        weights = np.asarray(lookup["weight"])
+        # Same checks as the CSV rows below, applied to whole columns
+        assert np.issubdtype(payouts.dtype, np.integer) and np.all(payouts >= 0), "Payout mult be uint64 format:"
+        assert np.all(
+            (payouts == 0) | (payouts >= 10)
+        ), "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
+        assert np.all(payouts % 10 == 0), "Payout values must be in increments of 10."
+        assert np.issubdtype(weights.dtype, np.integer) and np.all(weights >= 0), "Weight must be uint64 format."
+        integer_payouts = payouts.tolist()
+        running_weight_total = float(sum(weights.tolist()))
+        assert running_weight_total <= np.iinfo(np.uint64).max, "Sum of weights must be <= MAX(uint64)"
+        if len(payouts) > 0:
+            min_win, max_win = float(payouts.min()), float(payouts.max())
+        win_distribution = WinDistribution(payouts / 100, weights)
+        return win_distribution, integer_payouts, running_weight_total, min_win, max_win
 
     with open(filename, "r", encoding="UTF-8") as f:
         for line in f:
@@ -105,8 +114,10 @@ def verify_lookup_format(filename: str) -> list:
             # Weight checks
             assert weight.is_integer() and weight >= 0, "Weight must be uint64 format."
             running_weight_total += weight
+            weights.append(weight)
 
     assert running_weight_total <= np.iinfo(np.uint64).max, "Sum of weights must be <= MAX(uint64)"
+    win_distribution = WinDistribution(np.array(integer_payouts, dtype=np.float64) / 100, weights)
 
     return win_distribution, integer_payouts, running_weight_total, min_win, max_win
 
@@ -121,8 +132,8 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     book_payout_ints = []
     total_num_events = 0
     with open(books_filename, "rb") as f:
-        decompressor = zst.ZstdDecompressor()
-        with decompressor.stream_reader(f) as reader:
+        decompressor = get_books_decompressor(books_filename)
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = TextIOWrapper(reader, encoding="UTF-8")
             for line in txt_stream:
                 line = line.strip()
@@ -157,32 +168,31 @@ def get_num_non_zero_payouts(book_int_payouts) -> None:
 
 
 def get_lut_statistics(
-    win_distribution, bet_cost, unique_payouts, weight_range, min_win, max_win, num_events
+    dist: WinDistribution, bet_cost, unique_payouts, weight_range, min_win, max_win, num_events
 ) -> object:
     """Run RGS statistic tests for upload verification."""
-
-    var, std, skew, kurtosis = get_distribution_moments(win_distribution)
+    var, std, skew, kurtosis = dist.moments()
     MathStats = WinStatistics(
-        win_distribution=win_distribution,
+        win_distribution=dist,
         num_events=num_events,
         weight_range=weight_range,
         min_win=min_win,
         max_win=max_win,
-        min_diff=min_dist_difference(win_distribution),
+        min_diff=dist.min_difference(),
         unique_wins=unique_payouts,
-        average_wins=float(get_distribution_average(win_distribution)),
-        rtp=calculate_rtp(win_distribution, bet_cost, weight_range),
+        average_wins=dist.average(),
+        rtp=dist.rtp(bet_cost),
         std=std,
         var=var,
-        hr_max=get_maxwin_hitrate(win_distribution, weight_range),
-        non_zero_hr=non_zero_hitrate(win_distribution, weight_range),
-        prob_nil=get_prob_no_win(win_distribution, weight_range),
-        prob_less_bet=prob_less_than_bet(win_distribution, bet_cost, weight_range),
+        hr_max=dist.maxwin_hitrate(),
+        non_zero_hr=dist.non_zero_hitrate(),
+        prob_nil=dist.prob_no_win(),
+        prob_less_bet=dist.prob_less_than_bet(bet_cost),
         num_non_zero_payouts=get_num_non_zero_payouts(unique_payouts),
         skew=skew,
         excess_kurtosis=kurtosis,
     )
-    median = get_distribution_median(win_distribution, weight_range)
+    median = dist.median()
     if median > 0:
         m2m = MathStats.average_win / median
         MathStats.m2m = m2m
@@ -5,6 +5,8 @@ import importlib
 import json
 from typing import List, Dict
 
+from utils.indexed_books import IndexedBooks
+
 
 def load_game_config(game_id: str):
     """Load game config class"""
@@ -65,6 +67,15 @@ class ForceTool:
             print_results["simulation_ids"] = list(simulation_ids)
             f.write(json.dumps(print_results, indent=4))
 
+    def load_books(self, book_ids: List) -> list:
+        """
+        Load only the requested books, in the order of book_ids.
+        Requires books published with config.book_index_block_size.
+        """
+        books_name = os.path.join(self.config.publish_path, f"books_{self.target_mode}.jsonl.zst")
+        with IndexedBooks(books_name) as books:
+            return books.get_books(list(book_ids))
+
     def transform_serch_dict(self, item: dict) -> list:
         """Transform force_record format."""
         tranform_dict = {}
@@ -7,9 +7,11 @@ import os
 import json
 
 ABS_PATH = Path(__file__).parent.parent
-sys.path.append(ABS_PATH)
+sys.path.append(str(ABS_PATH))
 os.chdir(ABS_PATH)
 
+from src.write_data.binary_lookup import get_binary_lookup_name, write_binary_lookup
+
 
 def swap_tables(game_name: str, game_mode: str, target_file_number: int):
     """Replace default optimization table."""
@@ -40,6 +42,9 @@ def swap_tables(game_name: str, game_mode: str, target_file_number: int):
             elif line == "Distribution":
                 start_recording = True
 
+    if os.path.exists(get_binary_lookup_name(new_lut_file)):
+        write_binary_lookup(new_lut_file)
+
 
 def process_many_files(game_id, file_dict: dict) -> None:
     """Swap out multiple optimization files."""